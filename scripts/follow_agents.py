@@ -8,7 +8,6 @@ import sys
 from typing import Iterable
 from urllib.parse import quote
 
-import httpx
 from dotenv import load_dotenv
 
 SCRIPT_DIR = os.path.dirname(__file__)
@@ -20,20 +19,16 @@ from scrapers.moltbook_scraper import (  # noqa: E402
     scrape_post_comments,
     auth_block_reason,
     get_auth_block_status,
+    is_auth_blocked,
+    shared_client,
+    _client,
+    _post,
 )
 from reporters.auto_replier import get_my_posts  # noqa: E402
 
 
-BASE_URL = os.getenv("MOLTBOOK_BASE_URL", "https://www.moltbook.com/api/v1")
-API_KEY = os.getenv("MOLTBOOK_API_KEY", "")
-
-
-def _headers() -> dict:
-    key = API_KEY or os.getenv("MOLTBOOK_API_KEY", "")
-    return {
-        "Authorization": f"Bearer {key}",
-        "Content-Type": "application/json",
-    }
+FOLLOW_CONCURRENCY = 4
+COMMENT_FETCH_CONCURRENCY = 8
 
 
 def _load_top_agent_names(limit: int | None = None) -> list[str]:
@@ -50,14 +45,17 @@ def _load_top_agent_names(limit: int | None = None) -> list[str]:
 
 
 def _collect_author_names(comments: list[dict], names: set[str]) -> None:
-    for comment in comments:
+    # Walk nested reply threads iteratively so deep threads can't hit the recursion limit
+    stack = list(comments)
+    while stack:
+        comment = stack.pop()
         author = comment.get("author", {})
         author_name = author.get("name") if isinstance(author, dict) else str(author)
         if author_name:
             names.add(author_name)
         replies = comment.get("replies", [])
         if replies:
-            _collect_author_names(replies, names)
+            stack.extend(replies)
 
 
 async def _load_commenter_names(limit: int | None = None) -> list[str]:
@@ -66,12 +64,17 @@ async def _load_commenter_names(limit: int | None = None) -> list[str]:
         log.warning("No posts found for current agent.")
         return []
 
+    sem = asyncio.Semaphore(COMMENT_FETCH_CONCURRENCY)
+
+    async def _fetch_comments(post_id: str) -> list[dict]:
+        async with sem:
+            return await scrape_post_comments(post_id)
+
+    post_ids = [post.get("id") or post.get("_id") for post in posts]
+    results = await asyncio.gather(*(_fetch_comments(pid) for pid in post_ids if pid))
+
     names: set[str] = set()
-    for post in posts:
-        post_id = post.get("id") or post.get("_id")
-        if not post_id:
-            continue
-        comments = await scrape_post_comments(post_id)
+    for comments in results:
         if comments:
             _collect_author_names(comments, names)
 
@@ -84,6 +87,32 @@ async def _load_commenter_names(limit: int | None = None) -> list[str]:
     return sorted_names
 
 
+async def _follow_one(
+    sem: asyncio.Semaphore,
+    name: str,
+    auth_failed: asyncio.Event,
+) -> bool | None:
+    """Follow a single agent. Returns None when skipped after an auth failure."""
+    async with sem:
+        if auth_failed.is_set():
+            return None
+
+        # _post shares the write limiter and in-flight bounds with every other writer
+        # and retries a 429 after the server's Retry-After.
+        async with _client() as client:
+            result = await _post(client, f"/agents/{quote(name)}/follow", {})
+
+        if result and result.get("success"):
+            return True
+        if is_auth_blocked(result):
+            auth_failed.set()
+            log.warning(f"Follow stopped for {name}: {auth_block_reason(result)}")
+        elif result:
+            status = result.get("status_code")
+            log.warning(f"Follow failed for {name}: {f'HTTP {status}' if status else result}")
+        return False
+
+
 async def _follow_agents(agent_names: Iterable[str], dry_run: bool) -> dict:
     followed = []
     skipped = []
@@ -91,43 +120,36 @@ async def _follow_agents(agent_names: Iterable[str], dry_run: bool) -> dict:
 
     tracked = set(get_state("followed_agent_names", []))
 
-    async with httpx.AsyncClient() as client:
-        for name in agent_names:
-            if name in tracked:
-                skipped.append(name)
-                continue
+    pending = []
+    for name in agent_names:
+        if name in tracked:
+            skipped.append(name)
+            continue
+
+        if dry_run:
+            log.info(f"[DRY RUN] Would follow {name}")
+            followed.append(name)
+            continue
+
+        pending.append(name)
 
-            path = f"/agents/{quote(name)}/follow"
-            url = f"{BASE_URL}{path}"
+    if pending:
+        sem = asyncio.Semaphore(FOLLOW_CONCURRENCY)
+        auth_failed = asyncio.Event()
+        results = await asyncio.gather(
+            *(_follow_one(sem, name, auth_failed) for name in pending)
+        )
 
-            if dry_run:
-                log.info(f"[DRY RUN] Would follow {name}")
+        for name, ok in zip(pending, results):
+            if ok:
                 followed.append(name)
-                continue
-
-            try:
-                resp = await client.post(url, headers=_headers(), timeout=30)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    if data.get("success"):
-                        followed.append(name)
-                        tracked.add(name)
-                    else:
-                        failed.append(name)
-                        log.warning(f"Follow failed for {name}: {data}")
-                elif resp.status_code == 401:
-                    failed.append(name)
-                    detail = resp.text[:300]
-                    log.warning(f"Follow stopped for {name}: HTTP 401 {detail}")
-                    break
-                else:
-                    failed.append(name)
-                    log.warning(f"Follow failed for {name}: HTTP {resp.status_code}")
-            except Exception as exc:
+                tracked.add(name)
+            elif ok is False:
                 failed.append(name)
-                log.warning(f"Follow error for {name}: {exc}")
 
-    set_state("followed_agent_names", sorted(tracked))
+    # Only rewrite (and re-sort) the tracked list when this run actually followed someone
+    if not dry_run and followed:
+        set_state("followed_agent_names", sorted(tracked))
     return {"followed": followed, "skipped": skipped, "failed": failed}
 
 
@@ -146,12 +168,7 @@ async def follow_from_latest(
         names.extend(await _load_commenter_names(limit or None))
 
     # Deduplicate while preserving order
-    seen: set[str] = set()
-    unique_names = []
-    for name in names:
-        if name not in seen:
-            seen.add(name)
-            unique_names.append(name)
+    unique_names = list(dict.fromkeys(names))
 
     if not unique_names:
         return {"followed": [], "skipped": [], "failed": []}
@@ -187,12 +204,13 @@ async def main() -> None:
             )
             return
 
-    result = await follow_from_latest(
-        top_agents=args.top_agents,
-        commenters=args.commenters,
-        limit=args.limit or None,
-        dry_run=args.dry_run,
-    )
+    async with shared_client():
+        result = await follow_from_latest(
+            top_agents=args.top_agents,
+            commenters=args.commenters,
+            limit=args.limit or None,
+            dry_run=args.dry_run,
+        )
     if not result["followed"] and not result["skipped"] and not result["failed"]:
         log.warning("No agents found to follow.")
         return
@@ -205,4 +223,9 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # optional: fall back to the stock asyncio loop
     asyncio.run(main())
@@ -1,50 +1,43 @@
 """Sentiment analyzer — lightweight keyword-based sentiment scoring."""
 
-import json
-import os
+import heapq
 import re
 from collections import Counter
 
-from utils import log
+from utils import log, load_settings
+from analyzers.trend_analyzer import extract_text
 
 # Load config
-_settings_path = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_settings_path, "r") as f:
-    _cfg = json.load(f)["analysis"]["sentiment_keywords"]
+_cfg = load_settings()["analysis"]["sentiment_keywords"]
 
-POS_WORDS = set(_cfg["positive"])
-NEG_WORDS = set(_cfg["negative"])
+POS_WORDS = frozenset(_cfg["positive"])
+NEG_WORDS = frozenset(_cfg["negative"])
+
+# Indexed by (score > 0.2) - (score < -0.2) + 1
+_LABELS = ("negative", "neutral", "positive")
+
+_URL_RE = re.compile(r"https?://\S+")
+_CODE_BLOCK_RE = re.compile(r"```[\s\S]*?```")
+_NON_ALPHA_RE = re.compile(r"[^a-zA-Z\s]")
 
 
 def _clean_text(text: str) -> str:
     """Basic text cleaning."""
-    text = re.sub(r"https?://\S+", "", text)
-    text = re.sub(r"```[\s\S]*?```", "", text)
-    text = re.sub(r"[^a-zA-Z\s]", " ", text)
+    text = _URL_RE.sub("", text)
+    text = _CODE_BLOCK_RE.sub("", text)
+    text = _NON_ALPHA_RE.sub(" ", text)
     return text.lower()
 
 
-def score_text(text: str) -> dict:
-    """
-    Score a piece of text for sentiment.
-
-    Returns: {"positive": int, "negative": int, "score": float, "label": str}
-    """
-    words = _clean_text(text).split()
-    pos_count = sum(1 for w in words if w in POS_WORDS)
-    neg_count = sum(1 for w in words if w in NEG_WORDS)
+def _score_counts(pos_count: int, neg_count: int) -> dict:
+    """Build a sentiment score from positive/negative word counts."""
     total = pos_count + neg_count
 
     if total == 0:
         return {"positive": 0, "negative": 0, "score": 0.0, "label": "neutral"}
 
     score = (pos_count - neg_count) / total
-    if score > 0.2:
-        label = "positive"
-    elif score < -0.2:
-        label = "negative"
-    else:
-        label = "neutral"
+    label = _LABELS[(score > 0.2) - (score < -0.2) + 1]
 
     return {
         "positive": pos_count,
@@ -54,6 +47,19 @@ def score_text(text: str) -> dict:
     }
 
 
+def score_text(text: str) -> dict:
+    """
+    Score a piece of text for sentiment.
+
+    Returns: {"positive": int, "negative": int, "score": float, "label": str}
+    """
+    words = _clean_text(text).split()
+    return _score_counts(
+        sum(map(POS_WORDS.__contains__, words)),
+        sum(map(NEG_WORDS.__contains__, words)),
+    )
+
+
 def analyze_sentiment(posts: list[dict]) -> dict:
     """
     Analyze sentiment across all posts.
@@ -72,26 +78,22 @@ def analyze_sentiment(posts: list[dict]) -> dict:
     log.info("💭 Running sentiment analysis...")
 
     results = []
-    pos_keywords_all = []
-    neg_keywords_all = []
+    pos_keyword_counts: Counter = Counter()
+    neg_keyword_counts: Counter = Counter()
 
     for post in posts:
-        text_parts = []
-        for key in ("title", "content", "body", "text"):
-            val = post.get(key, "")
-            if val:
-                text_parts.append(str(val))
-        full_text = " ".join(text_parts)
-
-        sent = score_text(full_text)
+        words = _clean_text(extract_text(post)).split()
+        pos_hits = list(filter(POS_WORDS.__contains__, words))
+        neg_hits = list(filter(NEG_WORDS.__contains__, words))
+
+        sent = _score_counts(len(pos_hits), len(neg_hits))
         sent["post_title"] = post.get("title", "")[:80]
         sent["post_id"] = post.get("id") or post.get("_id", "")
         results.append(sent)
 
         # Collect sentiment keywords found
-        words = _clean_text(full_text).split()
-        pos_keywords_all.extend([w for w in words if w in POS_WORDS])
-        neg_keywords_all.extend([w for w in words if w in NEG_WORDS])
+        pos_keyword_counts.update(pos_hits)
+        neg_keyword_counts.update(neg_hits)
 
     # Distribution
     dist = Counter(r["label"] for r in results)
@@ -102,22 +104,21 @@ def analyze_sentiment(posts: list[dict]) -> dict:
     scores = [r["score"] for r in results]
     avg_score = round(sum(scores) / max(len(scores), 1), 3)
 
-    # Top posts
-    sorted_by_score = sorted(results, key=lambda x: x["score"])
+    # Top posts (reversed so ties pick the later posts, as the old full sort did)
     top_positive = [
         {"title": r["post_title"], "score": r["score"]}
-        for r in sorted_by_score[-5:][::-1]
+        for r in heapq.nlargest(5, reversed(results), key=lambda x: x["score"])
         if r["score"] > 0
     ]
     top_negative = [
         {"title": r["post_title"], "score": r["score"]}
-        for r in sorted_by_score[:5]
+        for r in heapq.nsmallest(5, results, key=lambda x: x["score"])
         if r["score"] < 0
     ]
 
     # Top sentiment keywords
-    pos_kw_counts = Counter(pos_keywords_all).most_common(10)
-    neg_kw_counts = Counter(neg_keywords_all).most_common(10)
+    pos_kw_counts = pos_keyword_counts.most_common(10)
+    neg_kw_counts = neg_keyword_counts.most_common(10)
 
     analysis = {
         "distribution": dict(dist),
@@ -1,50 +1,66 @@
 """Trend analyzer — extracts keywords, topics, and patterns from Moltbook data."""
 
-import json
-import os
+import heapq
 import re
+import string
 from collections import Counter
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Iterable
 
-from utils import log, save_analysis, load_latest, load_previous
+from utils import log, save_analysis, load_latest, load_previous, load_settings
 
 # Load config
-_settings_path = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_settings_path, "r") as f:
-    _settings = json.load(f)
+_settings = load_settings()
 
 _cfg = _settings["analysis"]
 _reporting_cfg = _settings.get("reporting", {})
 
-STOP_WORDS = set(_cfg["stop_words"])
+STOP_WORDS = frozenset(_cfg["stop_words"])
 MIN_KW_LEN = _cfg["min_keyword_length"]
 TOP_KW_COUNT = _cfg["top_keywords_count"]
 TOP_WINDOW_HOURS = int(_reporting_cfg.get("top_window_hours", 6))
 TOP_POST_LIMIT = int(_reporting_cfg.get("top_post_limit", 5))
 SCORE_COMMENT_WEIGHT = int(_reporting_cfg.get("score_comment_weight", 2))
 
+# Compiled once; _tokenize runs for every post in the scrape
+_URL_RE = re.compile(r"https?://\S+")
+_CODE_BLOCK_RE = re.compile(r"```[\s\S]*?```")
+_INLINE_CODE_RE = re.compile(r"`[^`]+`")
+
+
+class _WordCharTable(dict):
+    """str.translate table mapping anything but ASCII alphanumerics, '-' and whitespace to a space."""
+
+    _ALLOWED = frozenset(string.ascii_letters + string.digits + "-")
+
+    def __missing__(self, codepoint: int) -> int:
+        char = chr(codepoint)
+        value = codepoint if char in self._ALLOWED or char.isspace() else ord(" ")
+        self[codepoint] = value
+        return value
+
+
+_WORD_CHAR_TABLE = _WordCharTable()
+
 
 # ──────────────────────────────────────────────
 # Text Processing
 # ──────────────────────────────────────────────
 
-def _extract_text(post: dict) -> str:
+_TEXT_KEYS = ("title", "content", "body", "text")
+
+
+def extract_text(post: dict) -> str:
     """Extract all text content from a post."""
-    parts = []
-    for key in ("title", "content", "body", "text"):
-        val = post.get(key, "")
-        if val:
-            parts.append(str(val))
-    return " ".join(parts)
+    return " ".join([str(val) for key in _TEXT_KEYS if (val := post.get(key))])
 
 
 def _tokenize(text: str) -> list[str]:
     """Tokenize text into lowercase words, filtering noise."""
-    text = re.sub(r"https?://\S+", "", text)       # remove URLs
-    text = re.sub(r"```[\s\S]*?```", "", text)      # remove code blocks
-    text = re.sub(r"`[^`]+`", "", text)              # remove inline code
-    text = re.sub(r"[^a-zA-Z0-9\s\-]", " ", text)   # keep alphanumeric
+    text = _URL_RE.sub("", text)              # remove URLs
+    text = _CODE_BLOCK_RE.sub("", text)       # remove code blocks
+    text = _INLINE_CODE_RE.sub("", text)      # remove inline code
+    text = text.translate(_WORD_CHAR_TABLE)   # keep alphanumeric
     words = text.lower().split()
     return [
         w for w in words
@@ -53,62 +69,61 @@ def _tokenize(text: str) -> list[str]:
 
 
 def _extract_bigrams(words: list[str]) -> list[str]:
-    """Extract meaningful two-word phrases."""
-    bigrams = []
-    for i in range(len(words) - 1):
-        bg = f"{words[i]} {words[i + 1]}"
-        if words[i] not in STOP_WORDS and words[i + 1] not in STOP_WORDS:
-            bigrams.append(bg)
-    return bigrams
+    """Extract two-word phrases from _tokenize output (already free of stop words)."""
+    return [f"{a} {b}" for a, b in zip(words, words[1:])]
 
 
 # ──────────────────────────────────────────────
 # Keyword Analysis
 # ──────────────────────────────────────────────
 
-def extract_keywords(posts: list[dict], top_n: int = TOP_KW_COUNT) -> list[dict]:
-    """
-    Extract top keywords from a list of posts.
+def post_key(post: dict) -> Any:
+    """Return the key posts are deduplicated by: id, then _id, then identity."""
+    return post.get("id") or post.get("_id") or id(post)
 
-    Returns: [{"keyword": str, "count": int, "frequency": float}, ...]
-    """
-    all_words = []
+
+def _count_tokens(posts: list[dict]) -> tuple[Counter, Counter]:
+    """Tokenize each post once, counting keywords and bigrams in the same pass (full analysis only)."""
+    keyword_counts: Counter = Counter()
+    bigram_counts: Counter = Counter()
     for post in posts:
-        text = _extract_text(post)
-        all_words.extend(_tokenize(text))
+        words = _tokenize(extract_text(post))
+        keyword_counts.update(words)
+        bigram_counts.update(_extract_bigrams(words))
+    return keyword_counts, bigram_counts
 
-    counter = Counter(all_words)
-    total = len(all_words) or 1
 
+def _rank_counts(counter: Counter, label: str, top_n: int) -> list[dict]:
+    """Format the most common entries of a counter with their frequencies."""
+    total = sum(counter.values()) or 1
     return [
         {
-            "keyword": word,
+            label: item,
             "count": count,
             "frequency": round(count / total, 4),
         }
-        for word, count in counter.most_common(top_n)
+        for item, count in counter.most_common(top_n)
     ]
 
 
-def extract_bigram_topics(posts: list[dict], top_n: int = 15) -> list[dict]:
-    """Extract top bigram (two-word) topics."""
-    all_bigrams = []
+def extract_keywords(posts: list[dict], top_n: int = TOP_KW_COUNT) -> list[dict]:
+    """
+    Extract top keywords from a list of posts.
+
+    Returns: [{"keyword": str, "count": int, "frequency": float}, ...]
+    """
+    keyword_counts: Counter = Counter()
     for post in posts:
-        text = _extract_text(post)
-        words = _tokenize(text)
-        all_bigrams.extend(_extract_bigrams(words))
+        keyword_counts.update(_tokenize(extract_text(post)))
+    return _rank_counts(keyword_counts, "keyword", top_n)
 
-    counter = Counter(all_bigrams)
-    total = len(all_bigrams) or 1
 
-    return [
-        {
-            "topic": bg,
-            "count": count,
-            "frequency": round(count / total, 4),
-        }
-        for bg, count in counter.most_common(top_n)
-    ]
+def extract_bigram_topics(posts: list[dict], top_n: int = 15) -> list[dict]:
+    """Extract top bigram (two-word) topics."""
+    bigram_counts: Counter = Counter()
+    for post in posts:
+        bigram_counts.update(_extract_bigrams(_tokenize(extract_text(post))))
+    return _rank_counts(bigram_counts, "topic", top_n)
 
 
 # ──────────────────────────────────────────────
@@ -171,22 +186,27 @@ def analyze_agent_patterns(posts: list[dict]) -> dict:
             post.get("upvotes", 0) or post.get("score", 0) or 0
         )
 
-    # Compute stats
-    post_counts = [a["posts"] for a in agents.values()]
+    # Compute stats in one pass over the agents
     total_agents = len(agents)
+    total_posts = prolific = one_time = 0
+    for stats in agents.values():
+        count = stats["posts"]
+        total_posts += count
+        if count >= 3:
+            prolific += 1
+        elif count == 1:
+            one_time += 1
+
+    top_posters = heapq.nlargest(10, agents.items(), key=lambda item: item[1]["posts"])
 
     return {
         "unique_agents": total_agents,
         "total_posts_analyzed": len(posts),
-        "avg_posts_per_agent": round(sum(post_counts) / max(total_agents, 1), 2),
+        "avg_posts_per_agent": round(total_posts / max(total_agents, 1), 2),
         "agent_stats": {k: dict(v) for k, v in agents.items()},
-        "top_posters": sorted(
-            [{"name": k, **v} for k, v in agents.items()],
-            key=lambda x: x["posts"],
-            reverse=True,
-        )[:10],
-        "prolific_agents": len([c for c in post_counts if c >= 3]),
-        "one_time_posters": len([c for c in post_counts if c == 1]),
+        "top_posters": [{"name": k, **v} for k, v in top_posters],
+        "prolific_agents": prolific,
+        "one_time_posters": one_time,
     }
 
 
@@ -194,14 +214,14 @@ def analyze_agent_patterns(posts: list[dict]) -> dict:
 # Trend Comparison
 # ──────────────────────────────────────────────
 
-def compare_trends(current_keywords: list[dict], previous_keywords: list[dict]) -> list[dict]:
+def compare_trends(current_keywords: list[dict], previous_keywords: Iterable[dict]) -> list[dict]:
     """
     Compare current keywords with previous period.
 
+    previous_keywords is consumed in a single pass, so it may be a stream.
     Returns trend changes: rising, falling, new, stable.
     """
     prev_map = {k["keyword"]: k["count"] for k in previous_keywords}
-    curr_map = {k["keyword"]: k["count"] for k in current_keywords}
 
     changes = []
     for kw in current_keywords:
@@ -323,35 +343,27 @@ def run_full_analysis(data: dict) -> dict:
         if isinstance(posts, list):
             all_posts.extend(posts)
 
-    # Deduplicate by post ID
-    seen_ids = set()
-    unique_posts = []
+    # Deduplicate by post ID (first occurrence wins, feed order preserved)
+    posts_by_id: dict = {}
     for p in all_posts:
-        pid = p.get("id") or p.get("_id") or id(p)
-        if pid not in seen_ids:
-            seen_ids.add(pid)
-            unique_posts.append(p)
+        posts_by_id.setdefault(post_key(p), p)
+    unique_posts = list(posts_by_id.values())
 
     # Include submolt feeds for agent-level patterns
-    submolt_posts = []
     for posts in data.get("submolt_feeds", {}).values():
         if isinstance(posts, list):
-            submolt_posts.extend(posts)
-    agent_posts = []
-    agent_seen = set()
-    for p in unique_posts + submolt_posts:
-        pid = p.get("id") or p.get("_id") or id(p)
-        if pid not in agent_seen:
-            agent_seen.add(pid)
-            agent_posts.append(p)
+            for p in posts:
+                posts_by_id.setdefault(post_key(p), p)
+    agent_posts = list(posts_by_id.values())
 
     log.info(f"  → Analyzing {len(unique_posts)} unique posts...")
 
-    # Run analyses
-    keywords = extract_keywords(unique_posts)
+    # Run analyses (keywords and bigrams share a single tokenization pass)
+    keyword_counts, bigram_counts = _count_tokens(unique_posts)
+    keywords = _rank_counts(keyword_counts, "keyword", TOP_KW_COUNT)
     log.info(f"  → Extracted {len(keywords)} top keywords")
 
-    bigrams = extract_bigram_topics(unique_posts)
+    bigrams = _rank_counts(bigram_counts, "topic", 15)
     log.info(f"  → Extracted {len(bigrams)} bigram topics")
 
     submolt_activity = analyze_submolt_activity(data)
@@ -382,6 +394,7 @@ def run_full_analysis(data: dict) -> dict:
         "analyzed_at": datetime.now().isoformat(),
         "total_unique_posts": len(unique_posts),
         "keywords": keywords,
+        "top_keyword": keywords[0]["keyword"] if keywords else "",
         "bigram_topics": bigrams,
         "submolt_activity": submolt_activity,
         "top_posts_recent": top_posts_recent,
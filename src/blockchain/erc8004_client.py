@@ -1,15 +1,13 @@
 """ERC-8004 client — manages on-chain agent identity and reputation."""
 
-import json
 import os
+from functools import lru_cache
 from typing import Any
 
-from utils import log
+from utils import log, load_settings, dumps_json
 
 # Load settings
-_settings_path = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_settings_path, "r") as f:
-    _settings = json.load(f)["erc8004"]
+_settings = load_settings()["erc8004"]
 
 CHAIN_ID = int(os.getenv("ERC8004_CHAIN_ID", _settings.get("chain_id", 84532)))
 RPC_URL = os.getenv("ETH_RPC_URL", _settings.get("rpc_url", "https://sepolia.base.org"))
@@ -30,7 +28,7 @@ def generate_registration_file(
 
     This file is stored off-chain (IPFS/https) and linked on-chain via tokenURI.
     """
-    reg = _settings.get("registration", {}).copy()
+    reg = dict(_settings.get("registration", {}))
     reg["name"] = name
     if description:
         reg["description"] = description
@@ -45,15 +43,22 @@ def generate_registration_file(
     return reg
 
 
-def save_registration_file(reg: dict, filepath: str = None) -> str:
-    """Save registration file to disk."""
+def save_registration_file(reg: dict, filepath: str = None, pretty: bool = True) -> str:
+    """
+    Save registration file to disk.
+
+    The file is written to a temp path and swapped in with os.replace, so anything
+    serving or re-reading it never sees a partial write. pretty=False writes compact JSON.
+    """
     if filepath is None:
         data_dir = os.path.join(os.path.dirname(__file__), "..", "..", "data")
         os.makedirs(data_dir, exist_ok=True)
         filepath = os.path.join(data_dir, "agent_registration.json")
 
-    with open(filepath, "w") as f:
-        json.dump(reg, f, indent=2)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps_json(reg, indent=pretty))
+    os.replace(tmp_path, filepath)
 
     log.info(f"📋 Registration file saved to {filepath}")
     return filepath
@@ -96,6 +101,56 @@ IDENTITY_REGISTRY_ABI = [
 ]
 
 
+@lru_cache(maxsize=1)
+def _get_web3():
+    """Return a shared Web3 instance for RPC_URL (imports web3 lazily)."""
+    from web3 import Web3
+
+    return Web3(Web3.HTTPProvider(RPC_URL, request_kwargs={"timeout": 30}))
+
+
+@lru_cache(maxsize=8)
+def _get_registry_contract(registry_address: str):
+    """Return a cached Identity Registry contract object."""
+    from web3 import Web3
+
+    return _get_web3().eth.contract(
+        address=Web3.to_checksum_address(registry_address),
+        abi=IDENTITY_REGISTRY_ABI,
+    )
+
+
+# Next nonce per sender, so back-to-back transactions skip a get_transaction_count round trip
+_nonce_cache: dict[str, int] = {}
+
+
+def _send_transaction(w3, account, contract_call) -> Any:
+    """Build, sign and send a contract call from account. Returns the tx hash."""
+    address = account.address
+    nonce = _nonce_cache.get(address)
+    if nonce is None:
+        nonce = w3.eth.get_transaction_count(address, "pending")
+
+    tx = contract_call.build_transaction({
+        "from": address,
+        "nonce": nonce,
+        "gas": 300000,
+        "gasPrice": w3.eth.gas_price,
+        "chainId": CHAIN_ID,
+    })
+
+    signed = account.sign_transaction(tx)
+    try:
+        tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+    except Exception:
+        # Resync from the node next time rather than trusting a possibly stale counter
+        _nonce_cache.pop(address, None)
+        raise
+
+    _nonce_cache[address] = nonce + 1
+    return tx_hash
+
+
 async def register_on_chain(
     agent_uri: str,
     registry_address: str = None,
@@ -113,8 +168,6 @@ async def register_on_chain(
         {"agent_id": int, "tx_hash": str} or {"error": str}
     """
     try:
-        from web3 import Web3
-
         pk = private_key or os.getenv("ETH_PRIVATE_KEY", "")
         if not pk:
             return {"error": "ETH_PRIVATE_KEY not set. Cannot register on-chain."}
@@ -125,28 +178,15 @@ async def register_on_chain(
                 "Check 8004.org for deployed addresses on your target chain."
             }
 
-        w3 = Web3(Web3.HTTPProvider(RPC_URL))
+        w3 = _get_web3()
         if not w3.is_connected():
             return {"error": f"Cannot connect to RPC: {RPC_URL}"}
 
         account = w3.eth.account.from_key(pk)
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(registry_address),
-            abi=IDENTITY_REGISTRY_ABI,
-        )
+        contract = _get_registry_contract(registry_address)
 
-        # Build transaction
-        tx = contract.functions.register(agent_uri).build_transaction({
-            "from": account.address,
-            "nonce": w3.eth.get_transaction_count(account.address),
-            "gas": 300000,
-            "gasPrice": w3.eth.gas_price,
-            "chainId": CHAIN_ID,
-        })
-
-        # Sign and send
-        signed = account.sign_transaction(tx)
-        tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+        # Build, sign and send
+        tx_hash = _send_transaction(w3, account, contract.functions.register(agent_uri))
 
         log.info(f"📡 Registration TX sent: {tx_hash.hex()}")
 
@@ -193,8 +233,6 @@ async def update_agent_uri(
 ) -> dict:
     """Update agentURI for an existing ERC-8004 agent."""
     try:
-        from web3 import Web3
-
         pk = private_key or os.getenv("ETH_PRIVATE_KEY", "")
         if not pk:
             return {"error": "ETH_PRIVATE_KEY not set. Cannot update agentURI."}
@@ -208,26 +246,16 @@ async def update_agent_uri(
         if agent_id is None:
             return {"error": "Agent ID not provided. Cannot update agentURI."}
 
-        w3 = Web3(Web3.HTTPProvider(RPC_URL))
+        w3 = _get_web3()
         if not w3.is_connected():
             return {"error": f"Cannot connect to RPC: {RPC_URL}"}
 
         account = w3.eth.account.from_key(pk)
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(registry_address),
-            abi=IDENTITY_REGISTRY_ABI,
-        )
+        contract = _get_registry_contract(registry_address)
 
-        tx = contract.functions.setAgentURI(int(agent_id), agent_uri).build_transaction({
-            "from": account.address,
-            "nonce": w3.eth.get_transaction_count(account.address),
-            "gas": 300000,
-            "gasPrice": w3.eth.gas_price,
-            "chainId": CHAIN_ID,
-        })
-
-        signed = account.sign_transaction(tx)
-        tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+        tx_hash = _send_transaction(
+            w3, account, contract.functions.setAgentURI(int(agent_id), agent_uri)
+        )
 
         log.info(f"📡 setAgentURI TX sent: {tx_hash.hex()}")
 
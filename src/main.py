@@ -20,10 +20,11 @@ Usage:
 
 import argparse
 import asyncio
-import json
 import os
 import re
-from datetime import datetime
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
 import sys
 
 # Ensure src is in path
@@ -32,30 +33,41 @@ sys.path.insert(0, os.path.dirname(__file__))
 from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
-from utils import log, save_raw, load_latest, get_state, set_state
-from utils.llm_client import generate_llm_reply
+from utils import (
+    log,
+    load_latest_async,
+    get_state,
+    get_states,
+    set_state,
+    update_state,
+    content_hash,
+    dumps_json,
+    load_settings,
+)
 from scrapers.moltbook_scraper import (
     full_scrape,
     register_agent,
     check_status,
     get_me,
-    check_auth_status,
     create_post,
     auth_block_reason,
     get_auth_block_status,
     is_auth_blocked,
+    shared_client,
 )
-from analyzers.trend_analyzer import run_full_analysis, select_top_posts
-from analyzers.sentiment_analyzer import analyze_sentiment
-from reporters.markdown_reporter import generate_daily_report, generate_moltbook_post
-from reporters.moltbook_publisher import publish_report
-from reporters.auto_replier import auto_reply
-from reporters.proactive_commenter import proactive_comment
-from blockchain.erc8004_client import (
-    generate_registration_file,
-    save_registration_file,
-    register_on_chain,
-    print_setup_guide,
+
+# Analyzer, reporter, LLM and ERC-8004 modules are imported inside the commands
+# that use them, so light commands like --status don't pay for the full stack.
+
+# ──────────────────────────────────────────────
+# Configuration
+# ──────────────────────────────────────────────
+
+MOLTBOOK_API_KEY = os.getenv("MOLTBOOK_API_KEY", "")
+AGENT_NAME = os.getenv("MOLTBOOK_AGENT_NAME", "MoltBridgeAgent")
+GITHUB_REPO_URL = os.getenv(
+    "GITHUB_REPO_URL",
+    "https://github.com/YOUR_USERNAME/moltbook-8004-bridge-agent"
 )
 
 
@@ -64,22 +76,45 @@ from blockchain.erc8004_client import (
 # ──────────────────────────────────────────────
 
 def _deduplicate_posts(data: dict) -> list[dict]:
-    """Extract and deduplicate posts from scrape data."""
-    all_posts = []
+    """Extract and deduplicate posts from scrape data (first occurrence wins)."""
+    from analyzers.trend_analyzer import post_key
+
+    unique: dict = {}
     for key in ("hot_posts", "new_posts", "top_posts"):
         posts = data.get(key, [])
         if isinstance(posts, list):
-            all_posts.extend(posts)
+            for p in posts:
+                unique.setdefault(post_key(p), p)
+    return list(unique.values())
 
-    seen = set()
-    unique = []
-    for p in all_posts:
-        pid = p.get("id") or p.get("_id") or id(p)
-        if pid not in seen:
-            seen.add(pid)
-            unique.append(p)
-    return unique
 
+def _scrape_fingerprint(unique: list[dict]) -> str:
+    """Fingerprint a deduplicated post set by its IDs, ignoring feed order and vote counts."""
+    from analyzers.trend_analyzer import post_key
+
+    return content_hash(sorted(str(post_key(p)) for p in unique))
+
+
+async def _analyze(data: dict, unique: list[dict] | None = None) -> dict:
+    """Run trend + sentiment analysis.
+
+    Both stages only read the scrape data, so they run side by side in worker threads
+    and keep the event loop free. Pass unique when the caller already deduplicated posts.
+    """
+    from analyzers.trend_analyzer import run_full_analysis
+    from analyzers.sentiment_analyzer import analyze_sentiment
+
+    if unique is None:
+        unique = _deduplicate_posts(data)
+    analysis, sentiment = await asyncio.gather(
+        asyncio.to_thread(run_full_analysis, data),
+        asyncio.to_thread(analyze_sentiment, unique),
+    )
+    analysis["sentiment"] = sentiment
+    return analysis
+
+
+HOT_POSTED_HISTORY = 200  # featured source post ids remembered to avoid repeats
 
 _HOT_POST_TITLE_TEMPLATES = [
     "Signal Snapshot (Last {window_hours}h): {title}",
@@ -91,6 +126,20 @@ _HOT_POST_TITLE_TEMPLATES = [
 ]
 
 
+def _scraped_within(data: dict, max_age: timedelta) -> bool:
+    """Return True when the scrape's metadata.scraped_at is no older than max_age."""
+    scraped_at = data.get("metadata", {}).get("scraped_at")
+    if not scraped_at:
+        return False
+    try:
+        scraped_dt = datetime.fromisoformat(scraped_at.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    if scraped_dt.tzinfo is None:
+        scraped_dt = scraped_dt.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - scraped_dt <= max_age
+
+
 def _pick_hot_post_title(title: str, window_hours: int, source_id: str = "") -> str:
     """Pick a stable-but-varied hot-post title template."""
     now = datetime.utcnow()
@@ -100,6 +149,28 @@ def _pick_hot_post_title(title: str, window_hours: int, source_id: str = "") ->
     return template.format(window_hours=window_hours, title=title)
 
 
+_WS_RE = re.compile(r"\s+")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _summary_text(cleaned: str, max_sentences: int = 2, max_chars: int = 280) -> str:
+    """Keep the first few sentences of whitespace-normalized text, truncated to max_chars."""
+    if not cleaned:
+        return ""
+    sentences = _SENTENCE_END_RE.split(cleaned)
+    summary = " ".join(sentences[:max_sentences])
+    if len(summary) > max_chars:
+        summary = summary[: max_chars - 3].rstrip() + "..."
+    return summary
+
+
+def _excerpt_text(cleaned: str, max_chars: int = 360) -> str:
+    """Truncate whitespace-normalized text to max_chars."""
+    if len(cleaned) <= max_chars:
+        return cleaned
+    return cleaned[: max_chars - 3].rstrip() + "..."
+
+
 # ──────────────────────────────────────────────
 # Commands
 # ──────────────────────────────────────────────
@@ -119,26 +190,23 @@ async def cmd_analyze():
     log.info("🔬 MOLTBRIDGE — ANALYZE MODE")
     log.info("=" * 50)
 
-    data = load_latest("raw", "full_scrape")
+    data = await load_latest_async("raw", "full_scrape")
     if not data:
         log.error("No scrape data found. Run --scrape first.")
         return None
 
-    analysis = run_full_analysis(data)
-    unique = _deduplicate_posts(data)
-    sentiment = analyze_sentiment(unique)
-    analysis["sentiment"] = sentiment
-
-    return analysis
+    return await _analyze(data)
 
 
 async def cmd_report():
     """Generate a daily report."""
+    from reporters.markdown_reporter import generate_daily_report
+
     log.info("=" * 50)
     log.info("📝 MOLTBRIDGE — REPORT MODE")
     log.info("=" * 50)
 
-    analysis = load_latest("analyzed", "analysis")
+    analysis = await load_latest_async("analyzed", "analysis")
     if not analysis:
         log.error("No analysis data found. Run --analyze first.")
         return None
@@ -151,11 +219,13 @@ async def cmd_report():
 
 async def cmd_publish():
     """Publish report to Moltbook (tries agentintelligence first, falls back to general)."""
+    from reporters.moltbook_publisher import publish_report
+
     log.info("=" * 50)
     log.info("📤 MOLTBRIDGE — PUBLISH MODE")
     log.info("=" * 50)
 
-    analysis = load_latest("analyzed", "analysis")
+    analysis = await load_latest_async("analyzed", "analysis")
     if not analysis:
         log.error("No analysis data found. Run --analyze first.")
         return None
@@ -172,6 +242,8 @@ async def cmd_publish():
 
 async def cmd_reply(dry_run: bool = False):
     """Auto-reply to comments on our posts."""
+    from reporters.auto_replier import auto_reply
+
     log.info("=" * 50)
     log.info(f"💬 MOLTBRIDGE — AUTO-REPLY MODE {'(DRY RUN)' if dry_run else ''}")
     log.info("=" * 50)
@@ -186,8 +258,25 @@ async def cmd_reply(dry_run: bool = False):
     return result
 
 
+async def cmd_engage(dry_run: bool = False):
+    """Comment on trending posts using the latest analysis."""
+    from reporters.proactive_commenter import proactive_comment
+
+    analysis = await load_latest_async("analyzed", "analysis")
+    if not analysis:
+        log.error("No analysis data. Run --full first.")
+        return None
+    sentiment = analysis.get("sentiment", {})
+    return await proactive_comment(analysis, sentiment, max_comments=1, dry_run=dry_run)
+
+
 async def cmd_full():
     """Full pipeline: scrape → analyze → report → publish → reply."""
+    from reporters.markdown_reporter import generate_daily_report
+    from reporters.moltbook_publisher import publish_report
+    from reporters.auto_replier import auto_reply
+    from reporters.proactive_commenter import proactive_comment
+
     log.info("=" * 60)
     log.info("🚀 MOLTBRIDGE — FULL PIPELINE")
     log.info("=" * 60)
@@ -198,60 +287,83 @@ async def cmd_full():
         log.error("Scrape failed. Aborting pipeline.")
         return
 
-    # Step 2: Analyze
-    analysis = run_full_analysis(data)
+    # Nothing new since the last run: skip analyze/report/publish, still reply.
     unique = _deduplicate_posts(data)
-    sentiment = analyze_sentiment(unique)
-    analysis["sentiment"] = sentiment
+    fingerprint = _scrape_fingerprint(unique)
+    if fingerprint == get_state("last_scrape_fingerprint"):
+        log.info("♻️ No new posts since the last run. Skipping analysis and publish.")
+        if MOLTBOOK_API_KEY:
+            auth_block = await get_auth_block_status()
+            if auth_block:
+                log.warning(f"⚠️ Auto-reply skipped: Moltbook auth blocked ({auth_block_reason(auth_block)})")
+            else:
+                reply_result = await auto_reply(max_replies=5, dry_run=False)
+                log.info(f"💬 Auto-reply: {reply_result.get('replies_sent', 0)} replies sent")
+        return None
+
+    # Step 2: Analyze
+    analysis = await _analyze(data, unique)
+    sentiment = analysis["sentiment"]
 
     # Step 3: Report
     report = await generate_daily_report(analysis, sentiment, include_sample_note=False)
     log.info("📝 Report generated")
 
-    # Step 4: Publish
-    api_key = os.getenv("MOLTBOOK_API_KEY", "")
+    # Step 4: Publish, comment on trending posts and reply to comments.
+    # The three flows hit independent endpoints, so they run concurrently.
     published = False
-    auth_block = None
-    if api_key:
+    if MOLTBOOK_API_KEY:
         auth_block = await get_auth_block_status()
         if auth_block:
             log.warning(
                 f"⚠️ Publish/comment flows skipped: Moltbook auth blocked ({auth_block_reason(auth_block)})"
             )
         else:
-            result = await publish_report(analysis, sentiment)
-            if result and result.get("success"):
+            log.info("🗣️ Publishing report, commenting on trending posts and replying to comments...")
+            result, comment_result, reply_result = await asyncio.gather(
+                publish_report(analysis, sentiment),
+                proactive_comment(analysis, sentiment, max_comments=1, dry_run=False),
+                auto_reply(max_replies=5, dry_run=False),
+                return_exceptions=True,
+            )
+
+            if isinstance(result, Exception):
+                log.warning(f"⚠️ Publish error: {result}. Report saved locally.")
+            elif result and result.get("success"):
                 published = True
                 log.info("📤 Report published to Moltbook")
             elif is_auth_blocked(result):
-                auth_block = result
                 log.warning(
                     f"⚠️ Publish/comment flows skipped: Moltbook auth blocked ({auth_block_reason(result)})"
                 )
             else:
                 log.warning("⚠️ Publish failed (rate limit or other issue). Report saved locally.")
+
+            if isinstance(comment_result, Exception):
+                log.warning(f"⚠️ Proactive comment error (non-fatal): {comment_result}")
+            else:
+                log.info(f"🗣️ Proactive: {comment_result.get('comments_sent', 0)} comments posted")
+
+            if isinstance(reply_result, Exception):
+                log.warning(f"⚠️ Auto-reply error (non-fatal): {reply_result}")
+            else:
+                log.info(f"💬 Auto-reply: {reply_result.get('replies_sent', 0)} replies sent")
     else:
         log.warning("⚠️ MOLTBOOK_API_KEY not set. Skipping publish.")
 
-    # Step 5: Proactive commenting on other agents' posts
-    if api_key and analysis and not auth_block:
-        log.info("🗣️ Commenting on trending posts...")
-        await asyncio.sleep(2)
-        try:
-            comment_result = await proactive_comment(
-                analysis, sentiment, max_comments=1, dry_run=False
-            )
-            log.info(f"🗣️ Proactive: {comment_result.get('comments_sent', 0)} comments posted")
-        except Exception as e:
-            log.warning(f"⚠️ Proactive comment error (non-fatal): {e}")
-
-    # Update state
-    set_state("last_full_run", {
-        "timestamp": data.get("metadata", {}).get("scraped_at"),
-        "posts_analyzed": analysis.get("total_unique_posts"),
-        "top_keyword": analysis.get("keywords", [{}])[0].get("keyword", ""),
-        "published": published,
-    })
+    # Update state. The fingerprint only short-circuits later runs once this post set
+    # was actually published, so a failed or skipped publish is retried next time.
+    state_updates = {
+        "last_full_run": {
+            "timestamp": data.get("metadata", {}).get("scraped_at"),
+            "posts_analyzed": analysis.get("total_unique_posts"),
+            "top_keyword": analysis.get("top_keyword", ""),
+            "published": published,
+        },
+    }
+    if published:
+        state_updates["last_scrape_fingerprint"] = fingerprint
+    update_state(**state_updates)
 
     log.info("✅ Full pipeline complete!")
     return analysis
@@ -259,13 +371,13 @@ async def cmd_full():
 
 async def cmd_sample_report():
     """Generate a sample report with expanded limits and a sample note."""
+    from reporters.markdown_reporter import generate_daily_report
+
     log.info("=" * 50)
     log.info("🧪 MOLTBRIDGE — SAMPLE REPORT MODE")
     log.info("=" * 50)
 
-    settings_path = os.path.join(os.path.dirname(__file__), "..", "config", "settings.json")
-    with open(settings_path, "r") as f:
-        settings = json.load(f)
+    settings = load_settings()
 
     sample_limits = settings.get("moltbook", {}).get("sample_scrape_limits")
     if not sample_limits:
@@ -277,10 +389,8 @@ async def cmd_sample_report():
         log.error("Scrape failed. Aborting sample report.")
         return None
 
-    analysis = run_full_analysis(data)
-    unique = _deduplicate_posts(data)
-    sentiment = analyze_sentiment(unique)
-    analysis["sentiment"] = sentiment
+    analysis = await _analyze(data)
+    sentiment = analysis["sentiment"]
 
     report = await generate_daily_report(analysis, sentiment, include_sample_note=True)
     print("\n" + report)
@@ -289,13 +399,15 @@ async def cmd_sample_report():
 
 async def cmd_hot_post(dry_run: bool = False):
     """Publish a hot post summary based on the last few hours."""
+    from analyzers.trend_analyzer import select_top_posts
+    from utils.llm_client import generate_llm_reply
+
     log.info("=" * 50)
     log.info(f"🔥 MOLTBRIDGE — HOT POST MODE {'(DRY RUN)' if dry_run else ''}")
     log.info("=" * 50)
 
-    api_key = os.getenv("MOLTBOOK_API_KEY", "")
     if not dry_run:
-        if not api_key:
+        if not MOLTBOOK_API_KEY:
             log.warning("⚠️ MOLTBOOK_API_KEY not set. Skipping hot post.")
             return None
 
@@ -304,9 +416,7 @@ async def cmd_hot_post(dry_run: bool = False):
             log.warning(f"⚠️ Hot post skipped: Moltbook auth blocked ({auth_block_reason(auth_block)})")
             return auth_block
 
-    settings_path = os.path.join(os.path.dirname(__file__), "..", "config", "settings.json")
-    with open(settings_path, "r") as f:
-        settings = json.load(f)
+    settings = load_settings()
 
     reporting_cfg = settings.get("reporting", {})
     window_hours = int(reporting_cfg.get("hot_post_window_hours", 4))
@@ -315,7 +425,10 @@ async def cmd_hot_post(dry_run: bool = False):
     report_submolt = moltbook_cfg.get("report_submolt", "general")
     web_base_url = str(moltbook_cfg.get("web_base_url", "https://www.moltbook.com")).rstrip("/")
 
-    data = load_latest("raw", "full_scrape")
+    data = await load_latest_async("raw", "full_scrape")
+    if data and not _scraped_within(data, timedelta(hours=window_hours)):
+        log.info(f"Latest scrape is older than {window_hours}h. Scraping again...")
+        data = None
     if not data:
         data = await full_scrape()
     if not data:
@@ -335,7 +448,8 @@ async def cmd_hot_post(dry_run: bool = False):
 
     top_post = top_posts[0]
     source_id = top_post.get("id")
-    posted_ids = set(get_state("hot_posted_source_ids", []))
+    # Oldest-first rolling window of featured posts (membership scan is over <= 200 ids)
+    posted_ids = deque(get_state("hot_posted_source_ids", []), maxlen=HOT_POSTED_HISTORY)
     if source_id and source_id in posted_ids:
         log.info("Top post already featured. Skipping.")
         return None
@@ -343,33 +457,10 @@ async def cmd_hot_post(dry_run: bool = False):
     title = top_post.get("title") or "Untitled"
     author = top_post.get("author") or "unknown"
     submolt = top_post.get("submolt") or "general"
-    score = top_post.get("score", 0)
-    upvotes = top_post.get("upvotes", 0)
-    comments = top_post.get("comment_count", 0)
-    author_line = f"Author: @{author}" if author and author != "unknown" else "Author: unknown"
     raw_content = top_post.get("content") or top_post.get("body") or top_post.get("text") or ""
-    post_url = top_post.get("url") or (f"{web_base_url}/post/{source_id}" if source_id else "")
 
-    def _summary_text(text: str, max_sentences: int = 2, max_chars: int = 280) -> str:
-        cleaned = re.sub(r"\s+", " ", text.strip())
-        if not cleaned:
-            return ""
-        sentences = re.split(r"(?<=[.!?])\s+", cleaned)
-        summary = " ".join(sentences[:max_sentences])
-        if len(summary) > max_chars:
-            summary = summary[: max_chars - 3].rstrip() + "..."
-        return summary
-
-    def _excerpt_text(text: str, max_chars: int = 360) -> str:
-        cleaned = re.sub(r"\s+", " ", text.strip())
-        if len(cleaned) <= max_chars:
-            return cleaned
-        return cleaned[: max_chars - 3].rstrip() + "..."
-
-    summary_text = _summary_text(raw_content)
-    excerpt_text = _excerpt_text(raw_content)
-
-    llm_summary = await generate_llm_reply(
+    # Start the LLM summary first; the formatting below runs while it is in flight.
+    llm_task = asyncio.create_task(generate_llm_reply(
         "hot_post_summary",
         {
             "post_title": title,
@@ -377,29 +468,34 @@ async def cmd_hot_post(dry_run: bool = False):
             "submolt": submolt,
             "post_content": raw_content,
         },
-    )
+    ))
+
+    score = top_post.get("score", 0)
+    upvotes = top_post.get("upvotes", 0)
+    comments = top_post.get("comment_count", 0)
+    author_line = f"Author: @{author}" if author and author != "unknown" else "Author: unknown"
+    post_url = top_post.get("url") or (f"{web_base_url}/post/{source_id}" if source_id else "")
+
+    cleaned_content = _WS_RE.sub(" ", raw_content.strip())
+    summary_text = _summary_text(cleaned_content)
+    excerpt_text = _excerpt_text(cleaned_content)
+
+    llm_summary = await llm_task
     if llm_summary:
         summary_text = llm_summary.strip()
         if len(summary_text) > 200:
             summary_text = summary_text[:197].rstrip() + "..."
 
     post_title = _pick_hot_post_title(title, window_hours, source_id or "")
-    content_parts = [
-        f"Highest-scoring post observed in the last {window_hours} hours.",
-        "",
-        f"Title: {title}",
-        author_line,
-        f"Submolt: m/{submolt}",
-        f"Score: {score} (upvotes {upvotes}, comments {comments})",
-    ]
-    if post_url:
-        content_parts.append(f"Link: {post_url}")
-    if summary_text:
-        content_parts.extend(["", "Signal Summary:", summary_text])
-    if excerpt_text:
-        content_parts.extend(["", "Observed Excerpt:", excerpt_text])
-
-    content = "\n".join(content_parts) + "\n"
+    link_line = f"Link: {post_url}\n" if post_url else ""
+    summary_block = f"\nSignal Summary:\n{summary_text}\n" if summary_text else ""
+    excerpt_block = f"\nObserved Excerpt:\n{excerpt_text}\n" if excerpt_text else ""
+    content = (
+        f"Highest-scoring post observed in the last {window_hours} hours.\n\n"
+        f"Title: {title}\n{author_line}\nSubmolt: m/{submolt}\n"
+        f"Score: {score} (upvotes {upvotes}, comments {comments})\n"
+        f"{link_line}{summary_block}{excerpt_block}"
+    )
 
     if dry_run:
         log.info("[DRY RUN] Hot post content preview:")
@@ -409,19 +505,19 @@ async def cmd_hot_post(dry_run: bool = False):
     result = await create_post(report_submolt, post_title, content)
     if result and result.get("success"):
         log.info("✅ Hot post published successfully!")
-        set_state(
-            "last_hot_post",
-            {
+        state_updates = {
+            "last_hot_post": {
                 "source_id": source_id,
                 "title": title,
                 "submolt": submolt,
                 "score": score,
                 "published_at": data.get("metadata", {}).get("scraped_at"),
             },
-        )
+        }
         if source_id:
-            posted_ids.add(source_id)
-            set_state("hot_posted_source_ids", list(posted_ids)[-200:])
+            posted_ids.append(source_id)
+            state_updates["hot_posted_source_ids"] = list(posted_ids)
+        update_state(**state_updates)
     else:
         log.warning(f"⚠️ Failed to publish hot post: {result}")
 
@@ -430,15 +526,14 @@ async def cmd_hot_post(dry_run: bool = False):
 
 async def cmd_register_moltbook():
     """Register agent on Moltbook."""
-    name = os.getenv("MOLTBOOK_AGENT_NAME", "MoltBridgeAgent")
     desc = (
         "Autonomous intelligence agent that monitors Moltbook trends, "
         "analyzes what AI agents are discussing, and publishes structured reports. "
         "Bridging Moltbook intelligence to the ERC-8004 ecosystem."
     )
 
-    log.info(f"📝 Registering '{name}' on Moltbook...")
-    result = await register_agent(name, desc)
+    log.info(f"📝 Registering '{AGENT_NAME}' on Moltbook...")
+    result = await register_agent(AGENT_NAME, desc)
 
     if result and "agent" in result:
         agent = result["agent"]
@@ -462,13 +557,10 @@ async def cmd_register_moltbook():
 
 async def cmd_generate_8004():
     """Generate ERC-8004 registration file."""
+    from blockchain.erc8004_client import generate_registration_file, save_registration_file
+
     log.info("📋 Generating ERC-8004 registration file...")
 
-    # Try to get GitHub repo URL from env
-    github_url = os.getenv(
-        "GITHUB_REPO_URL",
-        "https://github.com/YOUR_USERNAME/moltbook-8004-bridge-agent"
-    )
 
     reg = generate_registration_file(
         name="MoltBridgeAgent",
@@ -479,7 +571,7 @@ async def cmd_generate_8004():
             "AI agents are discussing and building. Bridges Moltbook data "
             "to the ERC-8004 trustless agent ecosystem."
         ),
-        web_endpoint=github_url,
+        web_endpoint=GITHUB_REPO_URL,
     )
 
     filepath = save_registration_file(reg)
@@ -488,7 +580,7 @@ async def cmd_generate_8004():
     print("📋 ERC-8004 REGISTRATION FILE GENERATED")
     print("=" * 60)
     print(f"\nFile: {filepath}")
-    print(f"\nContent:\n{json.dumps(reg, indent=2)}")
+    print(f"\nContent:\n{dumps_json(reg, indent=True).decode()}")
     print("\n" + "=" * 60)
     print("NEXT STEPS:")
     print("=" * 60)
@@ -515,13 +607,11 @@ async def cmd_generate_8004():
 
 async def cmd_register_8004(registry_address: str):
     """Register agent on ERC-8004 Identity Registry."""
+    from blockchain.erc8004_client import register_on_chain
+
     log.info(f"📡 Registering on ERC-8004 (registry: {registry_address})...")
 
-    github_url = os.getenv(
-        "GITHUB_REPO_URL",
-        "https://github.com/YOUR_USERNAME/moltbook-8004-bridge-agent"
-    )
-    agent_uri = f"{github_url}/raw/main/data/agent_registration.json"
+    agent_uri = f"{GITHUB_REPO_URL}/raw/main/data/agent_registration.json"
 
     result = await register_on_chain(agent_uri, registry_address)
 
@@ -549,85 +639,106 @@ async def cmd_register_8004(registry_address: str):
 
 async def cmd_status():
     """Check agent status on both platforms."""
-    print("\n" + "=" * 60)
-    print("📊 MOLTBRIDGE AGENT STATUS")
-    print("=" * 60)
+    lines = ["\n" + "=" * 60, "📊 MOLTBRIDGE AGENT STATUS", "=" * 60]
 
     # Moltbook status
-    api_key = os.getenv("MOLTBOOK_API_KEY", "")
-    if api_key:
-        status = await check_status()
-        me = await get_me()
-        print(f"\n🦞 Moltbook:")
-        print(f"   Status: {status}")
-        if me:
-            print(f"   Agent: {json.dumps(me, indent=4)}")
+    if MOLTBOOK_API_KEY:
+        status, me = await asyncio.gather(check_status(), get_me(), return_exceptions=True)
+        if isinstance(status, Exception):
+            log.warning(f"⚠️ Status check failed: {status}")
+            status = None
+        if isinstance(me, Exception):
+            log.warning(f"⚠️ Agent info fetch failed: {me}")
+            me = None
+        lines.append(f"\n🦞 Moltbook:")
+        lines.append(f"   Status: {status}")
+        if me and sys.stdout.isatty():
+            lines.append(f"   Agent: {dumps_json(me, indent=True).decode()}")
+        elif me:
+            agent = me.get("agent", me)
+            lines.append(f"   Agent: id={agent.get('id', 'N/A')} name={agent.get('name', 'N/A')}")
     else:
-        print("\n🦞 Moltbook: NOT REGISTERED (set MOLTBOOK_API_KEY)")
+        lines.append("\n🦞 Moltbook: NOT REGISTERED (set MOLTBOOK_API_KEY)")
+
+    state = get_states(erc8004_registration=None, replied_comment_ids=[], last_full_run=None)
 
     # ERC-8004 status
-    erc_reg = get_state("erc8004_registration")
+    erc_reg = state["erc8004_registration"]
     if erc_reg:
-        print(f"\n⛓️  ERC-8004:")
-        print(f"   Agent ID: {erc_reg.get('agent_id', 'N/A')}")
-        print(f"   Chain:    {erc_reg.get('chain_id', 'N/A')}")
-        print(f"   TX:       {erc_reg.get('tx_hash', 'N/A')}")
+        lines.append(f"\n⛓️  ERC-8004:")
+        lines.append(f"   Agent ID: {erc_reg.get('agent_id', 'N/A')}")
+        lines.append(f"   Chain:    {erc_reg.get('chain_id', 'N/A')}")
+        lines.append(f"   TX:       {erc_reg.get('tx_hash', 'N/A')}")
     else:
-        print("\n⛓️  ERC-8004: NOT REGISTERED (run --generate-8004 first)")
+        lines.append("\n⛓️  ERC-8004: NOT REGISTERED (run --generate-8004 first)")
 
     # Auto-reply stats
-    replied_count = len(get_state("replied_comment_ids", []))
-    print(f"\n💬 Auto-reply:")
-    print(f"   Total replies tracked: {replied_count}")
+    replied_count = len(state["replied_comment_ids"])
+    lines.append(f"\n💬 Auto-reply:")
+    lines.append(f"   Total replies tracked: {replied_count}")
 
     # Last run
-    last_run = get_state("last_full_run")
+    last_run = state["last_full_run"]
     if last_run:
-        print(f"\n📊 Last Run:")
-        print(f"   Time:      {last_run.get('timestamp', 'N/A')}")
-        print(f"   Posts:     {last_run.get('posts_analyzed', 'N/A')}")
-        print(f"   Top Topic: {last_run.get('top_keyword', 'N/A')}")
-        print(f"   Published: {'✅' if last_run.get('published') else '❌'}")
+        lines.append(f"\n📊 Last Run:")
+        lines.append(f"   Time:      {last_run.get('timestamp', 'N/A')}")
+        lines.append(f"   Posts:     {last_run.get('posts_analyzed', 'N/A')}")
+        lines.append(f"   Top Topic: {last_run.get('top_keyword', 'N/A')}")
+        lines.append(f"   Published: {'✅' if last_run.get('published') else '❌'}")
     else:
-        print("\n📊 No runs yet. Use --full to start.")
+        lines.append("\n📊 No runs yet. Use --full to start.")
+
+    lines.append("=" * 60)
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    print("=" * 60)
+
+_HEARTBEAT_MIN_INTERVAL = timedelta(hours=4)
+
+
+def _epoch_seconds(value) -> float | None:
+    """Epoch seconds from state; older state stored an ISO timestamp, converted here once."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
 
 
 async def cmd_heartbeat():
     """Run a heartbeat cycle (scrape + analyze + publish + reply if enough time passed)."""
-    log.info("💓 Heartbeat cycle starting...")
+    from reporters.auto_replier import auto_reply
 
-    from datetime import datetime, timedelta
+    log.info("💓 Heartbeat cycle starting...")
 
-    last_scrape = get_state("last_scrape_time")
-    min_interval = timedelta(hours=4)
+    now = time.time()
+    last_scrape = _epoch_seconds(get_state("last_scrape_time"))
 
-    if last_scrape:
-        try:
-            last_dt = datetime.fromisoformat(last_scrape)
-            if datetime.now() - last_dt < min_interval:
-                remaining = min_interval - (datetime.now() - last_dt)
-                log.info(
-                    f"⏳ Too soon since last scrape ({last_scrape}). "
-                    f"Next run in {remaining}. Skipping."
+    if last_scrape is not None:
+        elapsed = timedelta(seconds=now - last_scrape)
+        if elapsed < _HEARTBEAT_MIN_INTERVAL:
+            remaining = _HEARTBEAT_MIN_INTERVAL - elapsed
+            log.info(
+                f"⏳ Too soon since last scrape ({datetime.fromtimestamp(last_scrape).isoformat()}). "
+                f"Next run in {remaining}. Skipping."
+            )
+            # Still do auto-reply even if skipping scrape
+            auth_block = await get_auth_block_status()
+            if auth_block:
+                log.warning(
+                    f"⚠️ Auto-reply skipped during heartbeat: Moltbook auth blocked ({auth_block_reason(auth_block)})"
                 )
-                # Still do auto-reply even if skipping scrape
-                auth_block = await get_auth_block_status()
-                if auth_block:
-                    log.warning(
-                        f"⚠️ Auto-reply skipped during heartbeat: Moltbook auth blocked ({auth_block_reason(auth_block)})"
-                    )
-                else:
-                    log.info("💬 Running auto-reply anyway...")
-                    await auto_reply(max_replies=3, dry_run=False)
-                return
-        except (ValueError, TypeError):
-            pass
+            else:
+                log.info("💬 Running auto-reply anyway...")
+                await auto_reply(max_replies=3, dry_run=False)
+            return
 
     # Run full pipeline
     await cmd_full()
-    set_state("last_scrape_time", datetime.now().isoformat())
+    # Record when the cycle started so the interval doesn't drift by pipeline runtime
+    set_state("last_scrape_time", int(now))
     log.info("💓 Heartbeat complete!")
 
 
@@ -635,12 +746,67 @@ async def cmd_heartbeat():
 # CLI
 # ──────────────────────────────────────────────
 
-def main():
+async def _with_shared_client(coro):
+    """Run a command with one keep-alive Moltbook client shared by all its requests."""
+    async with shared_client():
+        return await coro
+
+
+def _run(coro):
+    return asyncio.run(_with_shared_client(coro))
+
+
+# argparse dest → coroutine factory. Checked in order, so earlier entries win
+# when several flags are passed (dry-run variants come first where they did).
+COMMANDS = {
+    "scrape": lambda args: cmd_scrape(),
+    "analyze": lambda args: cmd_analyze(),
+    "report": lambda args: cmd_report(),
+    "publish": lambda args: cmd_publish(),
+    "reply": lambda args: cmd_reply(dry_run=False),
+    "reply_dry": lambda args: cmd_reply(dry_run=True),
+    "hot_post_dry": lambda args: cmd_hot_post(dry_run=True),
+    "hot_post": lambda args: cmd_hot_post(dry_run=False),
+    "engage_dry": lambda args: cmd_engage(dry_run=True),
+    "engage": lambda args: cmd_engage(dry_run=False),
+    "full": lambda args: cmd_full(),
+    "register_moltbook": lambda args: cmd_register_moltbook(),
+    "generate_8004": lambda args: cmd_generate_8004(),
+    "register_8004": lambda args: cmd_register_8004(args.register_8004),
+    "status": lambda args: cmd_status(),
+    "heartbeat": lambda args: cmd_heartbeat(),
+    "sample_report": lambda args: cmd_sample_report(),
+}
+
+
+_COMMAND_HELP = {
+    "scrape": "Scrape Moltbook",
+    "analyze": "Analyze latest scrape",
+    "report": "Generate daily report",
+    "publish": "Publish report to Moltbook",
+    "reply": "Auto-reply to comments",
+    "reply-dry": "Preview replies (dry run)",
+    "hot-post": "Publish hot post summary",
+    "hot-post-dry": "Preview hot post summary",
+    "engage": "Comment on trending posts",
+    "engage-dry": "Preview engagement (dry run)",
+    "full": "Full pipeline",
+    "register-moltbook": "Register on Moltbook",
+    "generate-8004": "Generate ERC-8004 reg file",
+    "status": "Show agent status",
+    "heartbeat": "Run heartbeat cycle",
+    "sample-report": "Generate sample report",
+}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
     parser = argparse.ArgumentParser(
         description="MoltBridge Agent — Moltbook ↔ ERC-8004 Bridge",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
+  python src/main.py full                   # Same as --full; every flag has a subcommand form
   python src/main.py --full                 # Full pipeline (scrape+analyze+publish+reply)
   python src/main.py --scrape               # Just scrape
   python src/main.py --analyze              # Analyze latest data
@@ -658,68 +824,39 @@ Examples:
         """,
     )
 
-    parser.add_argument("--scrape", action="store_true", help="Scrape Moltbook")
-    parser.add_argument("--analyze", action="store_true", help="Analyze latest scrape")
-    parser.add_argument("--report", action="store_true", help="Generate daily report")
-    parser.add_argument("--publish", action="store_true", help="Publish report to Moltbook")
-    parser.add_argument("--reply", action="store_true", help="Auto-reply to comments")
-    parser.add_argument("--reply-dry", action="store_true", help="Preview replies (dry run)")
-    parser.add_argument("--hot-post", action="store_true", help="Publish hot post summary")
-    parser.add_argument("--hot-post-dry", action="store_true", help="Preview hot post summary")
-    parser.add_argument("--engage", action="store_true", help="Comment on trending posts")
-    parser.add_argument("--engage-dry", action="store_true", help="Preview engagement (dry run)")
-    parser.add_argument("--full", action="store_true", help="Full pipeline")
-    parser.add_argument("--register-moltbook", action="store_true", help="Register on Moltbook")
-    parser.add_argument("--generate-8004", action="store_true", help="Generate ERC-8004 reg file")
+    # Every command is available both as a legacy --flag (used by the workflows)
+    # and as a subcommand, e.g. `main.py full` or `main.py register-8004 ADDR`.
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    for name, help_text in _COMMAND_HELP.items():
+        parser.add_argument(f"--{name}", action="store_true", help=help_text)
+        subparsers.add_parser(name, help=help_text)
     parser.add_argument("--register-8004", type=str, metavar="ADDR", help="Register on ERC-8004")
-    parser.add_argument("--status", action="store_true", help="Show agent status")
-    parser.add_argument("--heartbeat", action="store_true", help="Run heartbeat cycle")
-    parser.add_argument("--sample-report", action="store_true", help="Generate sample report")
+    register_8004 = subparsers.add_parser("register-8004", help="Register on ERC-8004")
+    register_8004.add_argument("register_8004", metavar="ADDR")
+    return parser
 
-    args = parser.parse_args()
 
-    if not any(vars(args).values()):
-        parser.print_help()
+_PARSER = _build_parser()
+
+
+def main():
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # optional: fall back to the stock asyncio loop
+
+    args = _PARSER.parse_args()
+
+    if args.command:
+        flag = args.command.replace("-", "_")
+    else:
+        flag = next((name for name in COMMANDS if getattr(args, name)), None)
+    if flag is None:
+        _PARSER.print_help()
         return
 
-    if args.scrape:
-        asyncio.run(cmd_scrape())
-    elif args.analyze:
-        asyncio.run(cmd_analyze())
-    elif args.report:
-        asyncio.run(cmd_report())
-    elif args.publish:
-        asyncio.run(cmd_publish())
-    elif args.reply:
-        asyncio.run(cmd_reply(dry_run=False))
-    elif args.reply_dry:
-        asyncio.run(cmd_reply(dry_run=True))
-    elif args.hot_post or args.hot_post_dry:
-        asyncio.run(cmd_hot_post(dry_run=bool(args.hot_post_dry)))
-    elif args.engage or args.engage_dry:
-        dry = getattr(args, 'engage_dry', False)
-        async def _engage():
-            analysis = load_latest("analyzed", "analysis")
-            sentiment = analysis.get("sentiment", {}) if analysis else {}
-            if not analysis:
-                log.error("No analysis data. Run --full first.")
-                return
-            await proactive_comment(analysis, sentiment, max_comments=1, dry_run=dry)
-        asyncio.run(_engage())
-    elif args.full:
-        asyncio.run(cmd_full())
-    elif args.register_moltbook:
-        asyncio.run(cmd_register_moltbook())
-    elif args.generate_8004:
-        asyncio.run(cmd_generate_8004())
-    elif args.register_8004:
-        asyncio.run(cmd_register_8004(args.register_8004))
-    elif args.status:
-        asyncio.run(cmd_status())
-    elif args.heartbeat:
-        asyncio.run(cmd_heartbeat())
-    elif args.sample_report:
-        asyncio.run(cmd_sample_report())
+    _run(COMMANDS[flag](args))
 
 
 if __name__ == "__main__":
@@ -1,34 +1,51 @@
 """Auto-replier — reads comments on MoltBridge posts and replies contextually."""
 
 import asyncio
-import json
+import heapq
+import itertools
 import os
 import random
 import re
+import time
+from collections import Counter
+from collections.abc import Container
+from functools import lru_cache
 
 from scrapers.moltbook_scraper import (
     scrape_post_comments,
     create_comment,
     create_comment_reply,
+    _client,
     _get,
     _headers,
     BASE_URL,
     auth_block_reason,
     get_auth_block_status,
     is_auth_blocked,
+    shared_client,
 )
-from utils import log, get_state, set_state
+from utils import log, get_states, update_state, load_settings
 from utils.llm_client import generate_llm_reply
 
-import httpx
+try:
+    import ahocorasick
+except ImportError:  # optional: fall back to per-trigger substring checks
+    ahocorasick = None
+
+AGENT_NAME = os.getenv("MOLTBOOK_AGENT_NAME", "MoltBridgeAgent")
+_AGENT_NAME_LOWER = AGENT_NAME.lower()
 
 # Load settings
-_settings_path = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_settings_path, "r") as f:
-    _settings = json.load(f)
+_settings = load_settings()
 
 REPORT_SUBMOLT = _settings.get("moltbook", {}).get("report_submolt", "agentintelligence")
-STOP_WORDS = set(_settings.get("analysis", {}).get("stop_words", []))
+MY_POSTS_CACHE_TTL = 3600  # seconds an API lookup of our own posts stays reusable
+REPLIED_HISTORY = 500  # comment ids / signatures remembered to avoid double replies
+LLM_SKIP_SCORE = 2  # template match score at which the LLM rewrite may be skipped
+LLM_SKIP_CONFIDENT = bool(_settings.get("llm", {}).get("skip_on_confident_template", False))
+COMMENT_FETCH_BATCH = 5  # posts whose comments are fetched concurrently per round
+STOP_WORDS = frozenset(_settings.get("analysis", {}).get("stop_words", []))
+_TOKEN_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_-]{2,}")
 
 
 # ──────────────────────────────────────────────
@@ -134,44 +151,133 @@ DEFAULT_REPLIES = [
 ]
 
 
+# trigger → index into REPLY_PATTERNS, flattened once at import
+_TRIGGER_PATTERN = {
+    trigger: idx for idx, pattern in enumerate(REPLY_PATTERNS) for trigger in pattern["triggers"]
+}
+_QUESTION_PATTERNS = [
+    idx for idx, pattern in enumerate(REPLY_PATTERNS) if pattern["name"].startswith("question")
+]
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _build_trigger_automaton():
+    """Build an Aho-Corasick automaton over all triggers, or None without pyahocorasick."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for trigger in _TRIGGER_PATTERN:
+        automaton.add_word(trigger, trigger)
+    automaton.make_automaton()
+    return automaton
+
+
+_TRIGGER_AUTOMATON = _build_trigger_automaton()
+
+# Fallback: one pass with a zero-width lookahead so matches may overlap. Longest
+# triggers are tried first; shorter triggers that are whole-word prefixes of a match
+# ("how" in "how do you get") start at the same position and are credited with it.
+_TRIGGER_RE = re.compile(
+    r"(?=\b("
+    + "|".join(re.escape(t) for t in sorted(_TRIGGER_PATTERN, key=len, reverse=True))
+    + r")\b)"
+)
+_TRIGGER_PREFIXES = {
+    trigger: [
+        other for other in _TRIGGER_PATTERN
+        if len(other) < len(trigger)
+        and trigger.startswith(other)
+        and not _is_word_char(trigger[len(other)])
+    ]
+    for trigger in _TRIGGER_PATTERN
+}
+
+
+def _matched_triggers(text: str) -> set[str]:
+    """Return the triggers that occur in text as whole words."""
+    if _TRIGGER_AUTOMATON is not None:
+        found = set()
+        for end, trigger in _TRIGGER_AUTOMATON.iter(text):
+            start = end - len(trigger) + 1
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end + 1 < len(text) and _is_word_char(text[end + 1]):
+                continue
+            found.add(trigger)
+        return found
+
+    found = set()
+    for match in _TRIGGER_RE.finditer(text):
+        trigger = match.group(1)
+        found.add(trigger)
+        found.update(_TRIGGER_PREFIXES[trigger])
+    return found
+
+
+def _trigger_scores(text: str) -> list[int]:
+    """Count, per reply pattern, how many distinct triggers occur in text as whole words."""
+    scores = [0] * len(REPLY_PATTERNS)
+    for trigger in _matched_triggers(text):
+        scores[_TRIGGER_PATTERN[trigger]] += 1
+    return scores
+
+
+def _reply_cycle(replies: list[str]) -> itertools.cycle:
+    """Round-robin over a shuffled copy so every reply is used before any repeats."""
+    return itertools.cycle(random.sample(replies, len(replies)))
+
+
+_REPLY_CYCLES = {
+    pattern["name"]: _reply_cycle(pattern["replies"])
+    for pattern in REPLY_PATTERNS
+    if pattern.get("replies")
+}
+_DEFAULT_CYCLE = _reply_cycle(DEFAULT_REPLIES)
+
+
 def _choose_reply(entry: dict) -> str:
-    replies = entry.get("replies") or []
-    if not replies:
+    cycle = _REPLY_CYCLES.get(entry["name"])
+    if cycle is None:
         return entry.get("reply", "")
-    return random.choice(replies)
+    return next(cycle)
 
 
-def _extract_keywords(text: str, limit: int = 2) -> list[str]:
-    tokens = re.findall(r"[a-zA-Z][a-zA-Z0-9_-]{2,}", text.lower())
-    counts: dict[str, int] = {}
-    for token in tokens:
-        if token in STOP_WORDS:
-            continue
-        counts[token] = counts.get(token, 0) + 1
-    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
-    return [word for word, _ in ranked[:limit]]
+@lru_cache(maxsize=1024)
+def _extract_keywords(text: str, limit: int = 2) -> tuple[str, ...]:
+    counts = Counter(t for t in _TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS)
+    # Most frequent first, alphabetical on ties
+    ranked = heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
+    return tuple(word for word, _ in ranked)
 
 
-def _match_pattern(comment_text: str, post_title: str = "") -> tuple[str, str]:
-    """Match a comment to a reply pattern. Returns (reply, pattern_name)."""
-    combined = f"{comment_text} {post_title}".strip().lower()
-    is_question = "?" in comment_text
+@lru_cache(maxsize=1024)
+def _best_pattern_index(combined: str, is_question: bool) -> tuple[int | None, int]:
+    """(index, score) of the best-scoring reply pattern for normalized text; index is None if nothing matched."""
+    scores = _trigger_scores(combined)
+    if is_question:
+        for idx in _QUESTION_PATTERNS:
+            scores[idx] += 1
 
-    best_match = None
-    best_score = 0
+    # max() keeps the first pattern on ties, matching REPLY_PATTERNS priority order
+    best_idx = max(range(len(scores)), key=scores.__getitem__)
+    if scores[best_idx] < 1:
+        return None, 0
+    return best_idx, scores[best_idx]
 
-    for pattern in REPLY_PATTERNS:
-        score = sum(1 for trigger in pattern["triggers"] if trigger in combined)
-        if is_question and pattern["name"].startswith("question"):
-            score += 1
-        if score > best_score:
-            best_score = score
-            best_match = pattern
 
-    if best_match and best_score >= 1:
-        return _choose_reply(best_match), best_match["name"]
+def _match_pattern(text_lower: str, title_lower: str = "") -> tuple[str, str, int]:
+    """Match a lower-cased comment (and post title) to a reply pattern. Returns (reply, pattern_name, score)."""
+    # Scoring is pure, so it is cached; the reply rotation below is not.
+    combined = " ".join(f"{text_lower} {title_lower}".split())
+    best_idx, score = _best_pattern_index(combined, "?" in text_lower)
+    if best_idx is not None:
+        best_match = REPLY_PATTERNS[best_idx]
+        return _choose_reply(best_match), best_match["name"], score
 
-    return random.choice(DEFAULT_REPLIES), "default"
+    return next(_DEFAULT_CYCLE), "default", 0
 
 
 def _compose_reply(base_reply: str, comment_text: str, post_title: str = "") -> str:
@@ -185,37 +291,40 @@ def _compose_reply(base_reply: str, comment_text: str, post_title: str = "") ->
 
 
 def _normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text.strip().lower())
+    # split() drops leading/trailing whitespace and collapses runs, like strip() + \s+ → " "
+    return " ".join(text.lower().split())
 
 
-def _should_reply(comment: dict, replied_ids: set, my_agent_name: str) -> bool:
-    """Decide if we should reply to this comment."""
-    comment_id = comment.get("id") or comment.get("_id", "")
+def _author_name(item: dict) -> str:
+    """Author name of a post or comment; the API sends either an object or a bare name."""
+    author = item.get("author")
+    if type(author) is dict:
+        return author.get("name") or ""
+    return str(author) if author else ""
 
+
+def _should_reply(
+    comment_id: str,
+    author_lower: str,
+    text_lower: str,
+    replied_ids: Container[str],
+) -> bool:
+    """Decide if we should reply to a comment, given its pre-lowered author and text."""
     # Already replied
     if comment_id in replied_ids:
         return False
 
-    # Don't reply to ourselves
-    author = comment.get("author", {})
-    author_name = author.get("name") if isinstance(author, dict) else str(author)
-    if author_name and author_name.lower() == my_agent_name.lower():
-        return False
-
-    # Avoid obvious bots and auto-posters
-    if author_name and "bot" in author_name.lower():
+    # Don't reply to ourselves or to obvious bots and auto-posters
+    if author_lower and (author_lower == _AGENT_NAME_LOWER or "bot" in author_lower):
         return False
 
     # Don't reply to empty comments
-    content = comment.get("content", "") or comment.get("body", "") or ""
-    if len(content.strip()) < 20:
+    content_lower = text_lower.strip()
+    if len(content_lower) < 20:
         return False
 
     # Skip link-only or command-only comments
-    content_lower = content.strip().lower()
-    if content_lower.startswith("http://") or content_lower.startswith("https://"):
-        return False
-    if content_lower.startswith("!"):
+    if content_lower.startswith(("http://", "https://", "!")):
         return False
 
     return True
@@ -227,18 +336,43 @@ def _should_reply(comment: dict, replied_ids: set, my_agent_name: str) -> bool:
 
 async def get_my_posts() -> list[dict]:
     """Fetch posts created by MoltBridgeAgent."""
-    agent_name = os.getenv("MOLTBOOK_AGENT_NAME", "MoltBridgeAgent")
+    state = get_states(published_post_ids=[], last_report_published={}, my_posts_cache={})
 
     # Prefer locally tracked post IDs (reliable even if API listing is missing)
-    published_ids = get_state("published_post_ids", [])
+    published_ids = state["published_post_ids"]
     if published_ids:
         return [{"id": post_id} for post_id in published_ids]
 
-    last_published = get_state("last_report_published", {})
+    last_published = state["last_report_published"]
     last_post_id = last_published.get("post_id") if isinstance(last_published, dict) else None
     if last_post_id and last_post_id != "unknown":
         return [{"id": last_post_id}]
-    async with httpx.AsyncClient() as client:
+
+    # The API lookup below costs up to four requests; reuse a recent result
+    cache = state["my_posts_cache"]
+    if (
+        cache.get("agent") == AGENT_NAME
+        and time.time() - cache.get("ts", 0) < MY_POSTS_CACHE_TTL
+        and cache.get("posts")
+    ):
+        return cache["posts"]
+
+    my_posts = await _fetch_my_posts()
+    if my_posts:
+        update_state(my_posts_cache={
+            "agent": AGENT_NAME,
+            "ts": time.time(),
+            "posts": [
+                {"id": post.get("id") or post.get("_id"), "title": post.get("title", "")}
+                for post in my_posts
+            ],
+        })
+    return my_posts
+
+
+async def _fetch_my_posts() -> list[dict]:
+    """Look up our posts through the API: agent endpoint first, then listing scan."""
+    async with _client() as client:
         # Try agent-specific endpoint (if available)
         result = await _get(client, "/agents/me/posts")
         if result and isinstance(result, list):
@@ -246,35 +380,35 @@ async def get_my_posts() -> list[dict]:
         if result and "posts" in result:
             return result["posts"]
 
-        # Fallback: search in recent posts
+        # Fallback: search recent posts and the report submolt feed (newest first).
+        # The reads are independent, so they run concurrently.
         log.info("  → Falling back to manual post search...")
-        all_posts = []
-        for sort in ("new", "hot"):
-            resp = await _get(client, "/posts", {"sort": sort, "limit": 50})
+        requests = [
+            _get(client, "/posts", {"sort": "new", "limit": 50}),
+            _get(client, "/posts", {"sort": "hot", "limit": 50}),
+        ]
+        if REPORT_SUBMOLT:
+            requests.append(
+                _get(client, f"/submolts/{REPORT_SUBMOLT}/feed", {"sort": "new", "limit": 50})
+            )
+
+        # Deduplicate posts that show up in several listings (first occurrence wins)
+        all_posts: dict = {}
+        for resp in await asyncio.gather(*requests):
             if resp and isinstance(resp, list):
-                all_posts.extend(resp)
+                posts = resp
             elif resp and "posts" in resp:
-                all_posts.extend(resp["posts"])
-            await asyncio.sleep(1)
-
-        # Also scan report submolt feed (newest posts first)
-        if REPORT_SUBMOLT:
-            feed = await _get(client, f"/submolts/{REPORT_SUBMOLT}/feed", {"sort": "new", "limit": 50})
-            if feed and isinstance(feed, list):
-                all_posts.extend(feed)
-            elif feed and "posts" in feed:
-                all_posts.extend(feed["posts"])
-            await asyncio.sleep(1)
+                posts = resp["posts"]
+            else:
+                continue
+            for post in posts:
+                all_posts.setdefault(post.get("id") or post.get("_id") or id(post), post)
 
         # Filter by author
-        my_posts = []
-        for post in all_posts:
-            author = post.get("author", {})
-            name = author.get("name") if isinstance(author, dict) else str(author)
-            if name and name.lower() == agent_name.lower():
-                my_posts.append(post)
-
-        return my_posts
+        return [
+            post for post in all_posts.values()
+            if _AGENT_NAME_LOWER and _author_name(post).lower() == _AGENT_NAME_LOWER
+        ]
 
 
 # ──────────────────────────────────────────────
@@ -292,7 +426,12 @@ async def auto_reply(max_replies: int = 5, dry_run: bool = False) -> dict:
     Returns:
         Summary of actions taken
     """
-    agent_name = os.getenv("MOLTBOOK_AGENT_NAME", "MoltBridgeAgent")
+    # One keep-alive client for the listing, comment reads and replies (the caller's, if open)
+    async with shared_client():
+        return await _auto_reply(max_replies, dry_run)
+
+
+async def _auto_reply(max_replies: int, dry_run: bool) -> dict:
     log.info(f"💬 Auto-reply starting (max {max_replies} replies, dry_run={dry_run})...")
 
     if not dry_run:
@@ -307,10 +446,20 @@ async def auto_reply(max_replies: int = 5, dry_run: bool = False) -> dict:
                 "skipped_reason": "auth_blocked",
             }
 
-    # Load previously replied comment IDs
-    replied_ids = set(get_state("replied_comment_ids", []))
-    replied_signatures = set(get_state("replied_signatures", []))
-    reply_text_signatures = set(get_state("reply_text_signatures", []))
+    # Load previously replied comment IDs. Dicts act as insertion-ordered sets, so
+    # O(1) membership and the saved windows below drop the oldest entries first.
+    state = get_states(
+        replied_comment_ids=[],
+        replied_signatures=[],
+        reply_text_signatures=[],
+        post_last_comment={},
+    )
+    replied_ids = dict.fromkeys(state["replied_comment_ids"])
+    replied_signatures = dict.fromkeys(state["replied_signatures"])
+    reply_text_signatures = dict.fromkeys(state["reply_text_signatures"])
+    # post id → newest comment id already walked; comments are read newest-first, so the
+    # scan of a post stops once it reaches the previous run's cursor.
+    post_cursors = dict(state["post_last_comment"])
 
     # Get our posts
     my_posts = await get_my_posts()
@@ -324,106 +473,139 @@ async def auto_reply(max_replies: int = 5, dry_run: bool = False) -> dict:
     posts_checked = 0
     auth_blocked = False
 
-    for post in my_posts:
+    targets = [(post, post.get("id") or post.get("_id")) for post in my_posts]
+    targets = [(post, post_id) for post, post_id in targets if post_id]
+
+    # Comment reads are fetched a batch at a time, concurrently; replies stay sequential.
+    for start in range(0, len(targets), COMMENT_FETCH_BATCH):
         if replies_sent >= max_replies or auth_blocked:
             break
 
-        post_id = post.get("id") or post.get("_id")
-        if not post_id:
-            continue
-
-        posts_checked += 1
-        log.info(f"  → Checking comments on post {post_id[:8]}...")
-
-        # Fetch comments
-        comments = await scrape_post_comments(post_id)
-        if not comments:
-            continue
+        batch = targets[start:start + COMMENT_FETCH_BATCH]
+        for _, post_id in batch:
+            log.info(f"  → Checking comments on post {post_id[:8]}...")
+        comment_lists = await asyncio.gather(
+            *(scrape_post_comments(post_id, sort="new") for _, post_id in batch)
+        )
 
-        await asyncio.sleep(1)
-
-        replied_authors = set()
-        used_templates = set()
-
-        for comment in comments:
-            if replies_sent >= max_replies:
+        for (post, post_id), comments in zip(batch, comment_lists):
+            if replies_sent >= max_replies or auth_blocked:
                 break
 
-            if not _should_reply(comment, replied_ids, agent_name):
+            posts_checked += 1
+            if not comments:
                 continue
 
-            comment_id = comment.get("id") or comment.get("_id", "")
-            comment_text = comment.get("content", "") or comment.get("body", "")
-            author = comment.get("author", {})
-            author_name = author.get("name") if isinstance(author, dict) else str(author)
-
-            # Generate reply
+            replied_authors = set()
+            used_templates = set()
             post_title = post.get("title", "") or ""
-            reply_text, template_name = _match_pattern(comment_text, post_title)
-            reply_text = _compose_reply(reply_text, comment_text, post_title)
-
-            llm_reply = await generate_llm_reply(
-                "auto_reply",
-                {
-                    "post_title": post_title,
-                    "comment_text": comment_text,
-                },
-            )
-            if llm_reply:
-                reply_text = llm_reply
-            if author_name:
-                reply_text = f"@{author_name} {reply_text}"
-
-            reply_text_signature = _normalize_text(reply_text)
-            if reply_text_signature in reply_text_signatures:
-                continue
+            title_lower = post_title.lower()
+            cursor = post_cursors.get(post_id)
+            walked_all = True
 
-            # Avoid repeating same template or replying multiple times to same author per post
-            if template_name in used_templates:
-                continue
-            if author_name and author_name.lower() in replied_authors:
-                continue
-
-            signature = f"{post_id}:{author_name.lower() if author_name else 'unknown'}:{template_name}"
-            if signature in replied_signatures:
-                continue
-
-            log.info(f"  → Replying to @{author_name}: \"{comment_text[:50]}...\"")
+            for comment in comments:
+                if replies_sent >= max_replies:
+                    walked_all = False
+                    break
 
-            if dry_run:
-                log.info(f"    [DRY RUN] Would reply: \"{reply_text}\"")
-            else:
-                result = await create_comment_reply(comment_id, reply_text)
-                if not result:
-                    result = await create_comment(post_id, reply_text, parent_id=comment_id)
-                if not result:
-                    result = await create_comment(post_id, reply_text)
-
-                if result:
-                    log.info(f"    ✅ Reply sent!")
-                elif is_auth_blocked(result):
-                    log.warning(
-                        f"    ⚠️ Replying stopped: Moltbook auth blocked ({auth_block_reason(result)})"
+                comment_id = comment.get("id") or comment.get("_id", "")
+                if cursor and comment_id == cursor:
+                    break  # older comments were walked on a previous run
+
+                # Lower-case each field once and reuse it for filtering, matching and signatures
+                comment_text = comment.get("content", "") or comment.get("body", "") or ""
+                author_name = _author_name(comment)
+                author_lower = author_name.lower()
+                text_lower = comment_text.lower()
+
+                if not _should_reply(comment_id, author_lower, text_lower, replied_ids):
+                    continue
+
+                # Generate reply
+                reply_text, template_name, score = _match_pattern(text_lower, title_lower)
+                reply_text = _compose_reply(reply_text, comment_text, post_title)
+
+                # Canned templates only go out unrewritten when explicitly enabled in settings
+                if not (LLM_SKIP_CONFIDENT and score >= LLM_SKIP_SCORE):
+                    llm_reply = await generate_llm_reply(
+                        "auto_reply",
+                        {
+                            "post_title": post_title,
+                            "comment_text": comment_text,
+                        },
                     )
-                    auth_blocked = True
-                    break
+                    if llm_reply:
+                        reply_text = llm_reply
+                # Sign the body before the mention so one text can't go out to several authors
+                reply_text_signature = _normalize_text(reply_text)
+                if author_name:
+                    reply_text = f"@{author_name} {reply_text}"
+
+                # Avoid repeating a reply text or template, or replying twice to the same author
+                # per post. These comments are only put off until a later run, so the cursor
+                # must not move past them.
+                if (
+                    reply_text_signature in reply_text_signatures
+                    or template_name in used_templates
+                    or (author_lower and author_lower in replied_authors)
+                ):
+                    walked_all = False
+                    continue
+
+                signature = f"{post_id}:{author_lower or 'unknown'}:{template_name}"
+                if signature in replied_signatures:
+                    continue
+
+                log.info(f"  → Replying to @{author_name}: \"{comment_text[:50]}...\"")
+
+                if dry_run:
+                    log.info(f"    [DRY RUN] Would reply: \"{reply_text}\"")
                 else:
-                    log.warning(f"    ⚠️ Reply failed")
-                await asyncio.sleep(3)  # Rate limit between replies
-
-            # Track as replied
-            replied_ids.add(comment_id)
-            replied_signatures.add(signature)
-            reply_text_signatures.add(reply_text_signature)
-            if author_name:
-                replied_authors.add(author_name.lower())
-            used_templates.add(template_name)
-            replies_sent += 1
-
-    # Save replied IDs
-    set_state("replied_comment_ids", list(replied_ids)[-500:])  # Keep last 500
-    set_state("replied_signatures", list(replied_signatures)[-500:])
-    set_state("reply_text_signatures", list(reply_text_signatures)[-500:])
+                    result = await create_comment_reply(comment_id, reply_text)
+                    if not result:
+                        result = await create_comment(post_id, reply_text, parent_id=comment_id)
+                    if not result:
+                        result = await create_comment(post_id, reply_text)
+
+                    # Auth failures come back as (truthy) error payloads, so check them first
+                    if is_auth_blocked(result):
+                        log.warning(
+                            f"    ⚠️ Replying stopped: Moltbook auth blocked ({auth_block_reason(result)})"
+                        )
+                        auth_blocked = True
+                        break
+                    elif result:
+                        log.info(f"    ✅ Reply sent!")
+                    else:
+                        log.warning(f"    ⚠️ Reply failed")
+
+                # Track as replied
+                replied_ids[comment_id] = None
+                replied_signatures[signature] = None
+                reply_text_signatures[reply_text_signature] = None
+                if author_lower:
+                    replied_authors.add(author_lower)
+                used_templates.add(template_name)
+                replies_sent += 1
+
+            # Advance the cursor only when every newer comment was settled this run; a dry
+            # run sends nothing, so it must not consume comments either.
+            newest_id = comments[0].get("id") or comments[0].get("_id")
+            if walked_all and not auth_blocked and not dry_run and newest_id:
+                post_cursors[post_id] = newest_id
+
+    # Save replied IDs (keep the most recent REPLIED_HISTORY of each)
+    state_updates = {
+        "replied_comment_ids": list(replied_ids)[-REPLIED_HISTORY:],
+        "replied_signatures": list(replied_signatures)[-REPLIED_HISTORY:],
+        "reply_text_signatures": list(reply_text_signatures)[-REPLIED_HISTORY:],
+    }
+    if not dry_run:
+        # Only cursors for posts still in our listing are worth keeping
+        state_updates["post_last_comment"] = {
+            post_id: post_cursors[post_id] for _, post_id in targets if post_id in post_cursors
+        }
+    update_state(**state_updates)
 
     summary = {
         "replies_sent": replies_sent,
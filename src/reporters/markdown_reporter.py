@@ -1,10 +1,8 @@
 """Markdown report generator — produces engaging, readable reports from analysis."""
 
-import json
-import os
 from datetime import datetime
 
-from utils import log, save_report, load_previous
+from utils import log, save_report, load_previous, load_settings
 from utils.llm_client import generate_llm_reply
 
 
@@ -44,26 +42,32 @@ def _trend_bar(pct: float) -> str:
     return "█" * filled + "░" * (10 - filled)
 
 
-_settings_path = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_settings_path, "r") as f:
-    _settings = json.load(f)
+_settings = load_settings()
 
 _reporting_cfg = _settings.get("reporting", {})
 _MIN_SUBMOLT_POSTS = int(_reporting_cfg.get("min_submolt_posts", 3))
 
+# Moltbook post skeleton: fixed header and footer around the optional sections
+_POST_HEADER_TEMPLATE = (
+    "Observed Topics: {kw_list}\n\n"
+    "Sentiment Snapshot: {emoji} {pos}% positive | {neu}% neutral | {neg}% negative\n\n"
+    "Agents Covered: {agents}\n"
+    "Posts Sampled: {posts}\n\n"
+)
+_POST_FOOTER = "---\n*Generated by MoltBridge Agent — signal-focused reporting on Moltbook activity.*"
+
 
 async def generate_daily_report(analysis: dict, sentiment: dict, include_sample_note: bool = False) -> str:
     """Generate a comprehensive daily report in Markdown."""
     log.info("📝 Generating daily report...")
     now = datetime.now()
+    get = analysis.get
+    patterns = get("agent_patterns", {})
 
     lines = [
         f"# 🦞 Moltbook Ecosystem Report — {now.strftime('%d %B %Y, %H:%M UTC')}",
         "",
-        f"> Auto-generated by MoltBridge Agent | Analyzed: {analysis.get('total_unique_posts', 0)} posts from {analysis.get('agent_patterns', {}).get('unique_agents', '?')} agents",
-        "",
-        "---",
-        "",
+        f"> Auto-generated by MoltBridge Agent | Analyzed: {get('total_unique_posts', 0)} posts from {patterns.get('unique_agents', '?')} agents",
     ]
 
     if include_sample_note:
@@ -71,136 +75,121 @@ async def generate_daily_report(analysis: dict, sentiment: dict, include_sample_
             "Sample note: Insights are based on the latest hot/new/top feeds and "
             "targeted submolt scans collected during this run."
         )
-        lines.insert(3, f"> {sample_note}")
-        lines.insert(4, "")
+        lines += [f"> {sample_note}", ""]
+
+    lines += ["", "---", ""]
 
     # LLM Summary (optional)
     summary = await _generate_llm_summary(analysis, sentiment)
     if summary:
-        lines.append("## 🧭 LLM Summary")
-        lines.append("")
-        lines.append(summary)
-        lines.append("")
+        lines += ["## 🧭 LLM Summary", "", summary, ""]
         log.info("LLM summary added to report")
 
     # Top Keywords
-    lines.append("## 📈 Trending Topics")
-    lines.append("")
-    keywords = analysis.get("keywords", [])[:10]
-    for i, kw in enumerate(keywords, 1):
-        bar = _trend_bar(kw['frequency'] * 100 * 5)
-        lines.append(f"{i}. **{kw['keyword']}** — {kw['count']} mentions {bar}")
+    lines += ["## 📈 Trending Topics", ""]
+    lines += [
+        f"{i}. **{kw['keyword']}** — {kw['count']} mentions {_trend_bar(kw['frequency'] * 100 * 5)}"
+        for i, kw in enumerate(get("keywords", [])[:10], 1)
+    ]
     lines.append("")
 
     # Bigram Topics
-    bigrams = analysis.get("bigram_topics", [])[:8]
+    bigrams = get("bigram_topics", [])[:8]
     if bigrams:
-        lines.append("## 🔗 Hot Phrases")
-        lines.append("")
-        for bg in bigrams:
-            lines.append(f"- **{bg['topic']}** ({bg['count']}x)")
+        lines += ["## 🔗 Hot Phrases", ""]
+        lines += [f"- **{bg['topic']}** ({bg['count']}x)" for bg in bigrams]
         lines.append("")
 
     # Submolt Activity
     submolts = [
-        s for s in analysis.get("submolt_activity", [])
+        s for s in get("submolt_activity", [])
         if s.get("post_count", 0) >= _MIN_SUBMOLT_POSTS
     ][:6]
     if submolts:
-        lines.append("## 🏘️ Most Active Submolts")
-        lines.append("")
+        lines += ["## 🏘️ Most Active Submolts", ""]
 
     # Top conversations (last window)
-    top_posts = analysis.get("top_posts_recent", [])
+    top_posts = get("top_posts_recent", [])
     if top_posts:
-        window_hours = analysis.get("top_posts_window_hours", 6)
-        lines.append(f"## 🔥 Top Conversations (last {window_hours}h)")
-        lines.append("")
-        for post in top_posts:
-            title = post.get("title", "").strip() or "Untitled"
-            submolt = post.get("submolt", "")
-            score = post.get("score", 0)
-            comments = post.get("comment_count", 0)
-            upvotes = post.get("upvotes", 0)
-            tag = f"m/{submolt}" if submolt else ""
-            lines.append(
-                f"- {title} ({tag}) — score {score} | {upvotes} upvotes | {comments} comments"
-            )
-        lines.append("")
-        lines.append("| Submolt | Posts | Upvotes | Comments | Engagement |")
-        lines.append("|---------|-------|---------|----------|------------|")
-        for s in submolts:
-            lines.append(
-                f"| m/{s['submolt']} | {s['post_count']} | "
-                f"{s['total_upvotes']} | {s['total_comments']} | "
-                f"{s['engagement_score']} |"
-            )
+        lines += [f"## 🔥 Top Conversations (last {get('top_posts_window_hours', 6)}h)", ""]
+        lines += [
+            f"- {post.get('title', '').strip() or 'Untitled'} "
+            f"({'m/' + post['submolt'] if post.get('submolt') else ''}) — "
+            f"score {post.get('score', 0)} | {post.get('upvotes', 0)} upvotes | "
+            f"{post.get('comment_count', 0)} comments"
+            for post in top_posts
+        ]
+        lines += [
+            "",
+            "| Submolt | Posts | Upvotes | Comments | Engagement |",
+            "|---------|-------|---------|----------|------------|",
+        ]
+        lines += [
+            f"| m/{s['submolt']} | {s['post_count']} | "
+            f"{s['total_upvotes']} | {s['total_comments']} | "
+            f"{s['engagement_score']} |"
+            for s in submolts
+        ]
         lines.append("")
 
     # Sentiment
-    lines.append("## 💭 Sentiment Analysis")
-    lines.append("")
     pcts = sentiment.get("percentages", {})
     pos = pcts.get('positive', 0)
     neu = pcts.get('neutral', 0)
     neg = pcts.get('negative', 0)
-    lines.append(f"- {_sentiment_emoji(pos)} Positive: **{pos}%** {_trend_bar(pos)}")
-    lines.append(f"- ⚪ Neutral: **{neu}%** {_trend_bar(neu)}")
-    lines.append(f"- {_sentiment_emoji(100-neg)} Negative: **{neg}%** {_trend_bar(neg)}")
-    lines.append("")
+    lines += [
+        "## 💭 Sentiment Analysis",
+        "",
+        f"- {_sentiment_emoji(pos)} Positive: **{pos}%** {_trend_bar(pos)}",
+        f"- ⚪ Neutral: **{neu}%** {_trend_bar(neu)}",
+        f"- {_sentiment_emoji(100-neg)} Negative: **{neg}%** {_trend_bar(neg)}",
+        "",
+    ]
 
     # Sentiment keywords
     pos_kws = sentiment.get("positive_keywords", [])[:5]
     neg_kws = sentiment.get("negative_keywords", [])[:5]
+    if pos_kws:
+        lines.append("Positive signals: " + ", ".join(f"{pk['word']}({pk['count']})" for pk in pos_kws))
+    if neg_kws:
+        lines.append("Negative signals: " + ", ".join(f"{nk['word']}({nk['count']})" for nk in neg_kws))
     if pos_kws or neg_kws:
-        if pos_kws:
-            pw = ", ".join(f"{pk['word']}({pk['count']})" for pk in pos_kws)
-            lines.append(f"Positive signals: {pw}")
-        if neg_kws:
-            nw = ", ".join(f"{nk['word']}({nk['count']})" for nk in neg_kws)
-            lines.append(f"Negative signals: {nw}")
         lines.append("")
 
     # Trend Changes
-    changes = analysis.get("trend_changes", [])
+    changes = get("trend_changes", [])
     if changes:
-        lines.append("## 🌊 Trend Shifts (vs Previous Period)")
-        lines.append("")
         rising = [c for c in changes if "rising" in c["trend"] or "new" in c["trend"]][:5]
         falling = [c for c in changes if "falling" in c["trend"]][:3]
-
-        if rising:
-            for r in rising:
-                lines.append(f"- {r['trend']} **{r['keyword']}** (+{r['change_pct']}%)")
-        if falling:
-            for f_item in falling:
-                lines.append(f"- {f_item['trend']} **{f_item['keyword']}** ({f_item['change_pct']}%)")
+        lines += ["## 🌊 Trend Shifts (vs Previous Period)", ""]
+        lines += [f"- {r['trend']} **{r['keyword']}** (+{r['change_pct']}%)" for r in rising]
+        lines += [f"- {f_item['trend']} **{f_item['keyword']}** ({f_item['change_pct']}%)" for f_item in falling]
         lines.append("")
 
     # Agent Patterns
-    patterns = analysis.get("agent_patterns", {})
     if patterns:
-        lines.append("## 🤖 Agent Activity")
-        lines.append("")
-        lines.append(f"- Unique agents: **{patterns.get('unique_agents', 0)}**")
-        lines.append(f"- Highly active (3+ posts): **{patterns.get('prolific_agents', 0)}**")
-        lines.append(f"- One-time posters: **{patterns.get('one_time_posters', 0)}**")
-        lines.append("")
+        lines += [
+            "## 🤖 Agent Activity",
+            "",
+            f"- Unique agents: **{patterns.get('unique_agents', 0)}**",
+            f"- Highly active (3+ posts): **{patterns.get('prolific_agents', 0)}**",
+            f"- One-time posters: **{patterns.get('one_time_posters', 0)}**",
+            "",
+        ]
 
         top_posters = patterns.get("top_posters", [])[:5]
         if top_posters:
             lines.append("**Most active agents:**")
-            for tp in top_posters:
-                lines.append(f"- @{tp['name']} — {tp['posts']} posts, {tp['upvotes']} upvotes")
+            lines += [f"- @{tp['name']} — {tp['posts']} posts, {tp['upvotes']} upvotes" for tp in top_posters]
             lines.append("")
 
     # Footer
-    lines.extend([
+    lines += [
         "---",
         "",
         "*Auto-generated by MoltBridge Agent — bridging Moltbook intelligence to the agent ecosystem.*",
         f"*Report time: {now.isoformat()}*",
-    ])
+    ]
 
     report = "\n".join(lines)
     filepath = save_report(report, "daily_report")
@@ -228,17 +217,21 @@ async def generate_moltbook_post(analysis: dict, sentiment: dict) -> tuple[str,
     neu = pcts.get('neutral', 0)
     neg = pcts.get('negative', 0)
 
-    content = f"Observed Topics: {kw_list}\n\n"
-    content += f"Sentiment Snapshot: {_sentiment_emoji(pos)} {pos}% positive | {neu}% neutral | {neg}% negative\n\n"
-    content += (
-        f"Agents Covered: {patterns.get('unique_agents', '?')}\n"
-        f"Posts Sampled: {analysis.get('total_unique_posts', '?')}\n\n"
-    )
+    # Fixed header from the template; optional sections are collected and joined once
+    parts = [_POST_HEADER_TEMPLATE.format_map({
+        "kw_list": kw_list,
+        "emoji": _sentiment_emoji(pos),
+        "pos": pos,
+        "neu": neu,
+        "neg": neg,
+        "agents": patterns.get("unique_agents", "?"),
+        "posts": analysis.get("total_unique_posts", "?"),
+    })]
 
     # Active submolts
     if submolts:
         sm_list = ", ".join(f"m/{s['submolt']} ({s['post_count']})" for s in submolts)
-        content += f"Most Active Submolts: {sm_list}\n\n"
+        parts.append(f"Most Active Submolts: {sm_list}\n\n")
 
     # Top agents (change vs previous when possible)
     prev = load_previous("analyzed", "analysis") or {}
@@ -267,30 +260,28 @@ async def generate_moltbook_post(analysis: dict, sentiment: dict) -> tuple[str,
             agent_list = ", ".join(
                 f"@{a['name']} (+{a['delta_posts']})" for a in top_agents
             )
-            content += f"Highest Change Agents (vs last run): {agent_list}\n\n"
+            parts.append(f"Highest Change Agents (vs last run): {agent_list}\n\n")
         else:
             agent_list = ", ".join(f"@{a['name']} ({a['posts']})" for a in top_agents)
-            content += f"Most Active Agents: {agent_list}\n\n"
+            parts.append(f"Most Active Agents: {agent_list}\n\n")
 
     # Rising trends
     changes = analysis.get("trend_changes", [])
     rising = [c for c in changes if "rising" in c["trend"]][:3]
     if rising:
-        content += "Measured Upside: "
-        content += " ".join(f"📈 {r['keyword']} (+{r['change_pct']}%)" for r in rising)
-        content += "\n\n"
+        upside = " ".join(f"📈 {r['keyword']} (+{r['change_pct']}%)" for r in rising)
+        parts.append(f"Measured Upside: {upside}\n\n")
 
     # Falling trends
     falling = [c for c in changes if "falling" in c["trend"]][:2]
     if falling:
-        content += "Cooling Signals: "
-        content += " ".join(f"📉 {f['keyword']} ({f['change_pct']}%)" for f in falling)
-        content += "\n\n"
+        cooling = " ".join(f"📉 {f['keyword']} ({f['change_pct']}%)" for f in falling)
+        parts.append(f"Cooling Signals: {cooling}\n\n")
 
     # LLM Summary (optional)
     summary = await _generate_llm_summary(analysis, sentiment)
     if summary:
-        content += f"Scan Summary: {summary}\n\n"
+        parts.append(f"Scan Summary: {summary}\n\n")
         log.info("LLM summary added to Moltbook post")
 
     # Data-driven insight
@@ -298,12 +289,10 @@ async def generate_moltbook_post(analysis: dict, sentiment: dict) -> tuple[str,
     if not insight:
         insight = _select_insight(_collect_insights(analysis, sentiment), now, keywords)
     if insight:
-        content += f"Measured Insight: {insight}\n\n"
-
-    content += "---\n"
-    content += "*Generated by MoltBridge Agent — signal-focused reporting on Moltbook activity.*"
+        parts.append(f"Measured Insight: {insight}\n\n")
 
-    return title, content
+    parts.append(_POST_FOOTER)
+    return title, "".join(parts)
 
 
 async def _generate_llm_summary(analysis: dict, sentiment: dict) -> str:
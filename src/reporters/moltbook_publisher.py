@@ -1,17 +1,13 @@
 """Moltbook publisher — posts analysis reports back to Moltbook."""
 
 import asyncio
-import json
-import os
 
 from scrapers.moltbook_scraper import create_post, auth_block_reason, is_auth_blocked
 from reporters.markdown_reporter import generate_moltbook_post
-from utils import log, get_state, set_state
+from utils import log, get_state, update_state, load_settings
 
 # Load settings
-_settings_path = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_settings_path, "r") as f:
-    _settings = json.load(f)
+_settings = load_settings()
 
 REPORT_SUBMOLT = _settings["moltbook"].get("report_submolt", "general")
 
@@ -37,17 +33,22 @@ async def publish_report(analysis: dict, sentiment: dict) -> dict | None:
         post = result.get("post", {})
         post_id = post.get("id") or post.get("_id") or "unknown"
 
-        set_state("last_report_published", {
-            "title": title,
-            "submolt": REPORT_SUBMOLT,
-            "post_id": post_id,
-        })
+        updates = {
+            "last_report_published": {
+                "title": title,
+                "submolt": REPORT_SUBMOLT,
+                "post_id": post_id,
+            },
+        }
 
         if post_id != "unknown":
             published_ids = get_state("published_post_ids", [])
             if post_id not in published_ids:
                 published_ids.append(post_id)
-            set_state("published_post_ids", published_ids[-50:])
+            updates["published_post_ids"] = published_ids[-50:]
+            updates["my_posts_cache"] = {}  # our post list just changed
+
+        update_state(**updates)
     elif is_auth_blocked(result):
         log.warning(f"⚠️ Publish blocked by Moltbook auth state: {auth_block_reason(result)}")
     else:
@@ -1,10 +1,11 @@
 """Proactive commenter — MoltBridge comments on trending posts by other agents."""
 
 import asyncio
-import json
+import heapq
 import os
 import random
 import re
+from collections import Counter
 
 from scrapers.moltbook_scraper import (
     scrape_posts,
@@ -14,21 +15,22 @@ from scrapers.moltbook_scraper import (
     auth_block_reason,
     get_auth_block_status,
     is_auth_blocked,
+    shared_client,
 )
-from utils import log, get_state, set_state
+from utils import log, get_states, update_state, load_settings
 from utils.llm_client import generate_llm_reply
 
 
 AGENT_NAME = os.getenv("MOLTBOOK_AGENT_NAME", "MoltBridgeAgent")
+_AGENT_NAME_LOWER = AGENT_NAME.lower()
 
 # Load settings
-_settings_path = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_settings_path, "r") as f:
-    _settings = json.load(f)
+_settings = load_settings()
 
 TARGET_SUBMOLTS = _settings.get("moltbook", {}).get("target_submolts", [])
 SCRAPE_LIMITS = _settings.get("moltbook", {}).get("scrape_limits", {})
-STOP_WORDS = set(_settings.get("analysis", {}).get("stop_words", []))
+STOP_WORDS = frozenset(_settings.get("analysis", {}).get("stop_words", []))
+_TOKEN_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_-]{2,}")
 
 # ──────────────────────────────────────────────
 # Comment Templates by Topic
@@ -95,18 +97,15 @@ def _count_hits(text: str, keywords: list[str]) -> int:
 
 
 def _extract_keywords(text: str, limit: int = 2) -> list[str]:
-    tokens = re.findall(r"[a-zA-Z][a-zA-Z0-9_-]{2,}", text.lower())
-    counts: dict[str, int] = {}
-    for token in tokens:
-        if token in STOP_WORDS:
-            continue
-        counts[token] = counts.get(token, 0) + 1
-    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
-    return [word for word, _ in ranked[:limit]]
+    counts = Counter(t for t in _TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS)
+    # Most frequent first, alphabetical on ties
+    ranked = heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
+    return [word for word, _ in ranked]
 
 
 def _normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text.strip().lower())
+    # split() drops leading/trailing whitespace and collapses runs, like strip() + \s+ → " "
+    return " ".join(text.lower().split())
 
 
 def _append_post_context(comment_text: str, title: str, content: str) -> str:
@@ -198,7 +197,7 @@ def _should_comment(post: dict, commented_ids: set) -> bool:
     # Don't comment on our own posts
     author = post.get("author", {})
     name = author.get("name") if isinstance(author, dict) else str(author)
-    if name and name.lower() == AGENT_NAME.lower():
+    if name and name.lower() == _AGENT_NAME_LOWER:
         return False
 
     # Only comment on posts with some engagement (not spam)
@@ -238,6 +237,12 @@ async def proactive_comment(
     Returns:
         Summary of actions taken
     """
+    # One keep-alive client for feed reads, comment checks and posting (the caller's, if open)
+    async with shared_client():
+        return await _proactive_comment(analysis, sentiment, max_comments, dry_run)
+
+
+async def _proactive_comment(analysis: dict, sentiment: dict, max_comments: int, dry_run: bool) -> dict:
     log.info(f"🗣️ Proactive commenting starting (max {max_comments}, dry_run={dry_run})...")
 
     if not dry_run:
@@ -253,8 +258,9 @@ async def proactive_comment(
             }
 
     # Load previously commented post IDs
-    commented_ids = set(get_state("proactive_comment_ids", []))
-    comment_signatures = set(get_state("proactive_comment_signatures", []))
+    state = get_states(proactive_comment_ids=[], proactive_comment_signatures=[])
+    commented_ids = set(state["proactive_comment_ids"])
+    comment_signatures = set(state["proactive_comment_signatures"])
 
     # Get hot posts
     hot_posts = await scrape_posts("hot", 20)
@@ -359,7 +365,7 @@ async def proactive_comment(
         for comment in comments or []:
             author = comment.get("author", {})
             name = author.get("name") if isinstance(author, dict) else str(author)
-            if name and name.lower() == AGENT_NAME.lower():
+            if name and name.lower() == _AGENT_NAME_LOWER:
                 already_commented = True
                 break
         if already_commented:
@@ -383,14 +389,15 @@ async def proactive_comment(
                 break
             else:
                 log.warning(f"    ⚠️ Comment failed")
-            await asyncio.sleep(5)  # Rate limit between comments
 
         commented_ids.add(post_id)
         comments_sent += 1
 
     # Save state (keep last 500)
-    set_state("proactive_comment_ids", list(commented_ids)[-500:])
-    set_state("proactive_comment_signatures", list(comment_signatures)[-500:])
+    update_state(
+        proactive_comment_ids=list(commented_ids)[-500:],
+        proactive_comment_signatures=list(comment_signatures)[-500:],
+    )
 
     summary = {
         "comments_sent": comments_sent,
@@ -1,15 +1,15 @@
 """Moltbook API scraper — collects posts, comments, and submolt data."""
 
 import asyncio
-import json
 import os
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
-from utils import log, save_raw
+from utils import log, save_raw, load_settings
 
 # ──────────────────────────────────────────────
 # Configuration
@@ -18,11 +18,13 @@ from utils import log, save_raw
 BASE_URL = os.getenv("MOLTBOOK_BASE_URL", "https://www.moltbook.com/api/v1")
 API_KEY = os.getenv("MOLTBOOK_API_KEY", "")
 RATE_LIMIT_DELAY = 2  # seconds between requests
+MAX_INFLIGHT_REQUESTS = int(os.getenv("MOLTBOOK_CONCURRENCY", "4"))
+MAX_INFLIGHT_WRITES = int(os.getenv("MOLTBOOK_MAX_INFLIGHT", "2"))
+MAX_RETRY_AFTER = 10  # cap on a server-requested 429 back-off, in seconds
+WRITES_PER_MINUTE = int(os.getenv("MOLTBOOK_WRITES_PER_MIN", "10"))  # POST budget shared by all writers
 
 # Load settings
-_settings_path = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_settings_path, "r") as f:
-    _settings = json.load(f)
+_settings = load_settings()
 
 _moltbook_settings = _settings["moltbook"]
 SCRAPE_LIMITS = _moltbook_settings["scrape_limits"]
@@ -32,6 +34,8 @@ _dynamic_enabled = bool(_dynamic_cfg.get("enabled", False))
 _dynamic_max = int(_dynamic_cfg.get("max_submolts", 20))
 _dynamic_min_posts = int(_dynamic_cfg.get("min_posts", 3))
 _dynamic_window_hours = int(_dynamic_cfg.get("activity_window_hours", 24))
+# Minimum gap between two POSTs, never below the 3s the writers used to sleep on their own
+MIN_WRITE_INTERVAL = max(3.0, float(_moltbook_settings.get("rate_limit_delay_seconds", RATE_LIMIT_DELAY)))
 
 
 def _headers() -> dict:
@@ -76,6 +80,119 @@ def _select_dynamic_submolts(submolts: list[dict]) -> list[str]:
     return [name for _, _, name in candidates]
 
 
+# ──────────────────────────────────────────────
+# HTTP Client
+# ──────────────────────────────────────────────
+
+_shared_client: httpx.AsyncClient | None = None
+_shared_client_users = 0
+
+# asyncio primitives bind to the loop that first waits on them, and scripts/tests may call
+# asyncio.run more than once, so the semaphores are created lazily for the running loop.
+_semaphore_loop: asyncio.AbstractEventLoop | None = None
+_request_sem: asyncio.BoundedSemaphore | None = None
+_write_sem: asyncio.BoundedSemaphore | None = None
+
+
+def _bind_semaphores() -> None:
+    global _semaphore_loop, _request_sem, _write_sem
+    loop = asyncio.get_running_loop()
+    if _semaphore_loop is not loop:
+        _semaphore_loop = loop
+        _request_sem = asyncio.BoundedSemaphore(MAX_INFLIGHT_REQUESTS)
+        _write_sem = asyncio.BoundedSemaphore(MAX_INFLIGHT_WRITES)
+
+
+def _request_slots() -> asyncio.BoundedSemaphore:
+    """Bounds every in-flight Moltbook request, reads included."""
+    _bind_semaphores()
+    return _request_sem
+
+
+def _write_slots() -> asyncio.BoundedSemaphore:
+    """Bounds concurrent POSTs across publish/comment/reply flows running under gather."""
+    _bind_semaphores()
+    return _write_sem
+
+
+class _TokenBucket:
+    """Async token bucket: up to `rate` acquisitions per `period` seconds, refilled continuously.
+
+    Starts with a single token and keeps at least `min_interval` seconds between grants,
+    so a fresh process paces its first writes instead of spending the whole budget at once.
+    """
+
+    def __init__(self, rate: int, period: float, min_interval: float = 0.0):
+        self._capacity = max(1, rate)
+        self._refill_per_sec = self._capacity / period
+        self._min_interval = min_interval
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._last_grant = float("-inf")
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def _loop_lock(self) -> asyncio.Lock:
+        # Created per running loop; the token count itself carries over between loops.
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock_loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def acquire(self) -> None:
+        async with self._loop_lock():
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._refill_per_sec
+                )
+                self._updated = now
+                wait = self._last_grant + self._min_interval - now
+                if self._tokens < 1:
+                    wait = max(wait, (1 - self._tokens) / self._refill_per_sec)
+                if wait <= 0:
+                    self._tokens -= 1
+                    self._last_grant = now
+                    return
+                await asyncio.sleep(wait)
+
+
+# Paces every POST instead of fixed sleeps in each writer; reads are unaffected.
+_write_limiter = _TokenBucket(WRITES_PER_MINUTE, 60, min_interval=MIN_WRITE_INTERVAL)
+
+
+@asynccontextmanager
+async def shared_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Route every Moltbook call made inside this block through one keep-alive client."""
+    global _shared_client, _shared_client_users
+    if _shared_client is None:
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        _shared_client = httpx.AsyncClient(limits=limits)
+
+    # Reference-counted so overlapping blocks (e.g. reporters run under gather) keep
+    # the client open until the last one exits.
+    client = _shared_client
+    _shared_client_users += 1
+    try:
+        yield client
+    finally:
+        _shared_client_users -= 1
+        if _shared_client_users == 0:
+            _shared_client = None
+            await client.aclose()
+
+
+@asynccontextmanager
+async def _client() -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the shared client when one is open, otherwise a short-lived one."""
+    if _shared_client is not None:
+        yield _shared_client
+    else:
+        async with httpx.AsyncClient() as client:
+            yield client
+
+
 # ──────────────────────────────────────────────
 # API Interaction
 # ──────────────────────────────────────────────
@@ -84,7 +201,8 @@ async def _get(client: httpx.AsyncClient, path: str, params: dict = None) -> dic
     """Make an authenticated GET request to Moltbook API."""
     url = f"{BASE_URL}{path}"
     try:
-        resp = await client.get(url, headers=_headers(), params=params, timeout=30)
+        async with _request_slots():
+            resp = await client.get(url, headers=_headers(), params=params, timeout=30)
         resp.raise_for_status()
         return resp.json()
     except httpx.HTTPStatusError as e:
@@ -95,11 +213,32 @@ async def _get(client: httpx.AsyncClient, path: str, params: dict = None) -> dic
         return None
 
 
+def _retry_after_seconds(resp: httpx.Response) -> float:
+    """Read the Retry-After header (seconds), defaulting to 1s and capped at MAX_RETRY_AFTER."""
+    try:
+        delay = float(resp.headers.get("Retry-After", "1"))
+    except ValueError:
+        delay = 1.0
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
 async def _post(client: httpx.AsyncClient, path: str, data: dict) -> dict | None:
     """Make an authenticated POST request to Moltbook API."""
     url = f"{BASE_URL}{path}"
     try:
-        resp = await client.post(url, headers=_headers(), json=data, timeout=30)
+        async with _write_slots():
+            await _write_limiter.acquire()
+            async with _request_slots():
+                resp = await client.post(url, headers=_headers(), json=data, timeout=30)
+            if resp.status_code == 429:
+                # Back off holding only the write slot so reads keep flowing, then retry once
+                # through the limiter like any other write.
+                delay = _retry_after_seconds(resp)
+                log.warning(f"⏳ Rate limited on POST {url}. Retrying in {delay:.0f}s...")
+                await asyncio.sleep(delay)
+                await _write_limiter.acquire()
+                async with _request_slots():
+                    resp = await client.post(url, headers=_headers(), json=data, timeout=30)
         resp.raise_for_status()
         return resp.json()
     except httpx.HTTPStatusError as e:
@@ -160,9 +299,10 @@ def auth_block_reason(result: dict | None) -> str:
 async def get_auth_block_status() -> dict | None:
     """Return details when the current API key is unauthorized or suspended."""
     url = f"{BASE_URL}/agents/me"
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         try:
-            resp = await client.get(url, headers=_headers(), timeout=20)
+            async with _request_slots():
+                resp = await client.get(url, headers=_headers(), timeout=20)
             if resp.status_code == 200:
                 return None
 
@@ -191,7 +331,7 @@ async def get_auth_block_status() -> dict | None:
 
 async def register_agent(name: str, description: str) -> dict | None:
     """Register a new agent on Moltbook. Returns API key and claim URL."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         result = await _post(client, "/agents/register", {
             "name": name,
             "description": description,
@@ -204,22 +344,23 @@ async def register_agent(name: str, description: str) -> dict | None:
 
 async def check_status() -> dict | None:
     """Check agent claim/activation status."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         return await _get(client, "/agents/status")
 
 
 async def get_me() -> dict | None:
     """Get current agent info."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         return await _get(client, "/agents/me")
 
 
 async def check_auth_status() -> int | None:
     """Return HTTP status code for auth check (e.g., 200 or 401)."""
     url = f"{BASE_URL}/agents/me"
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         try:
-            resp = await client.get(url, headers=_headers(), timeout=20)
+            async with _request_slots():
+                resp = await client.get(url, headers=_headers(), timeout=20)
             return resp.status_code
         except Exception as e:
             log.warning(f"Auth status check failed: {e}")
@@ -232,7 +373,7 @@ async def check_auth_status() -> int | None:
 
 async def scrape_posts(sort: str = "hot", limit: int = 50) -> list[dict]:
     """Fetch posts sorted by hot/new/top/rising."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         result = await _get(client, "/posts", {"sort": sort, "limit": limit})
         if result and isinstance(result, list):
             return result
@@ -245,7 +386,7 @@ async def scrape_posts(sort: str = "hot", limit: int = 50) -> list[dict]:
 
 async def scrape_submolts() -> list[dict]:
     """Fetch list of all submolts."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         result = await _get(client, "/submolts")
         if result and isinstance(result, list):
             return result
@@ -256,7 +397,7 @@ async def scrape_submolts() -> list[dict]:
 
 async def scrape_submolt_feed(submolt: str, sort: str = "hot", limit: int = 25) -> list[dict]:
     """Fetch posts from a specific submolt."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         result = await _get(
             client, f"/submolts/{submolt}/feed", {"sort": sort, "limit": limit}
         )
@@ -269,7 +410,7 @@ async def scrape_submolt_feed(submolt: str, sort: str = "hot", limit: int = 25)
 
 async def scrape_post_comments(post_id: str, sort: str = "top") -> list[dict]:
     """Fetch comments for a specific post."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         result = await _get(client, f"/posts/{post_id}/comments", {"sort": sort})
         if result and isinstance(result, list):
             return result
@@ -384,7 +525,7 @@ async def full_scrape(scrape_limits: dict | None = None) -> dict:
 
 async def create_post(submolt: str, title: str, content: str) -> dict | None:
     """Create a new post on Moltbook."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         result = await _post(client, "/posts", {
             "submolt": submolt,
             "title": title,
@@ -397,7 +538,7 @@ async def create_post(submolt: str, title: str, content: str) -> dict | None:
 
 async def create_comment(post_id: str, content: str, parent_id: str | None = None) -> dict | None:
     """Add a comment to a post (optionally as a reply to another comment)."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         payload = {"content": content}
         if parent_id:
             payload["parent_id"] = parent_id
@@ -406,7 +547,7 @@ async def create_comment(post_id: str, content: str, parent_id: str | None = Non
 
 async def create_comment_reply(comment_id: str, content: str) -> dict | None:
     """Reply to a comment if the API supports it."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         return await _post(client, f"/comments/{comment_id}/reply", {
             "content": content,
         })
@@ -414,5 +555,5 @@ async def create_comment_reply(comment_id: str, content: str) -> dict | None:
 
 async def upvote_post(post_id: str) -> dict | None:
     """Upvote a post."""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         return await _post(client, f"/posts/{post_id}/upvote", {})
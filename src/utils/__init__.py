@@ -1,10 +1,17 @@
 from .logger import log, setup_logger
+from .config import load_settings
 from .storage import (
     save_raw,
     save_analysis,
     save_report,
     load_latest,
+    load_latest_async,
     load_previous,
     get_state,
+    get_states,
     set_state,
+    update_state,
+    content_hash,
+    dumps_json,
+    loads_json,
 )
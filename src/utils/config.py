@@ -0,0 +1,26 @@
+"""Shared loader for config/settings.json."""
+
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping
+
+
+SETTINGS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only proxies and turn lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=1)
+def load_settings() -> Mapping[str, Any]:
+    """Parse settings.json once per process and return a read-only view shared by all callers."""
+    with open(SETTINGS_PATH, "rb") as f:
+        return _freeze(json.load(f))
@@ -10,14 +10,12 @@ from typing import Any
 import httpx
 from dotenv import load_dotenv
 
-from utils import log
+from utils import log, load_settings
 
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
 
 
-_SETTINGS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "config", "settings.json")
-with open(_SETTINGS_PATH, "r") as f:
-    _settings = json.load(f)
+_settings = load_settings()
 
 _LLM_SETTINGS = _settings.get("llm", {})
 
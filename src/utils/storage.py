@@ -1,14 +1,68 @@
 """JSON-based storage for scraped data, analysis results, and reports."""
 
+import asyncio
+import copy
+import hashlib
 import json
 import os
 from datetime import datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Mapping
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
 
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
 
 
+def _json_default(value: Any) -> Any:
+    # Read-only settings views (MappingProxyType) serialize as plain objects
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def dumps_json(data: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(
+        data,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        default=_json_default,
+    ).encode("utf-8")
+
+
+def loads_json(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json(filepath: str) -> Any:
+    """Read and parse a JSON file."""
+    with open(filepath, "rb") as f:
+        return loads_json(f.read())
+
+
+def _write_json(filepath: str, data: Any, indent: bool = False) -> None:
+    """Serialize data and write it to a JSON file."""
+    with open(filepath, "wb") as f:
+        f.write(dumps_json(data, indent=indent))
+
+
 def _ensure_dir(subdir: str) -> str:
     """Ensure a data subdirectory exists and return its path."""
     path = os.path.join(DATA_DIR, subdir)
@@ -23,8 +77,7 @@ def save_raw(data: dict, label: str = "scrape") -> str:
     filename = f"{label}_{timestamp}.json"
     filepath = os.path.join(dir_path, filename)
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+    _write_json(filepath, data, indent=True)
 
     return filepath
 
@@ -36,8 +89,7 @@ def save_analysis(data: dict, label: str = "analysis") -> str:
     filename = f"{label}_{timestamp}.json"
     filepath = os.path.join(dir_path, filename)
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+    _write_json(filepath, data, indent=True)
 
     return filepath
 
@@ -55,6 +107,27 @@ def save_report(content: str, label: str = "report") -> str:
     return filepath
 
 
+def content_hash(data: Any) -> str:
+    """Return a stable hash of JSON-serializable data."""
+    return hashlib.blake2b(dumps_json(data, sort_keys=True), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=8)
+def _load_json_cached(filepath: str, mtime_ns: int) -> Any:
+    """Parse a JSON file once per (path, mtime); the shared result is only handed out as a copy."""
+    return _read_json(filepath)
+
+
+def _load_file(dir_path: str, filename: str) -> dict:
+    """Load a stored file, reusing the parsed JSON when it has not changed on disk."""
+    filepath = os.path.join(dir_path, filename)
+    if filepath.endswith(".json"):
+        # Deep-copied so a caller mutating its result can't corrupt the cached parse
+        return copy.deepcopy(_load_json_cached(filepath, os.stat(filepath).st_mtime_ns))
+    with open(filepath, "r", encoding="utf-8") as f:
+        return {"content": f.read(), "filename": filename}
+
+
 def load_latest(subdir: str, prefix: str = "") -> dict | None:
     """Load the most recent file from a subdirectory."""
     dir_path = os.path.join(DATA_DIR, subdir)
@@ -68,11 +141,12 @@ def load_latest(subdir: str, prefix: str = "") -> dict | None:
     if not files:
         return None
 
-    filepath = os.path.join(dir_path, files[0])
-    with open(filepath, "r", encoding="utf-8") as f:
-        if filepath.endswith(".json"):
-            return json.load(f)
-        return {"content": f.read(), "filename": files[0]}
+    return _load_file(dir_path, files[0])
+
+
+async def load_latest_async(subdir: str, prefix: str = "") -> dict | None:
+    """load_latest run in a worker thread, so a cold disk read doesn't stall the event loop."""
+    return await asyncio.to_thread(load_latest, subdir, prefix)
 
 
 def load_previous(subdir: str, prefix: str = "", skip: int = 1) -> dict | None:
@@ -88,11 +162,7 @@ def load_previous(subdir: str, prefix: str = "", skip: int = 1) -> dict | None:
     if len(files) <= skip:
         return None
 
-    filepath = os.path.join(dir_path, files[skip])
-    with open(filepath, "r", encoding="utf-8") as f:
-        if filepath.endswith(".json"):
-            return json.load(f)
-        return {"content": f.read(), "filename": files[skip]}
+    return _load_file(dir_path, files[skip])
 
 
 def get_state(key: str, default: Any = None) -> Any:
@@ -101,20 +171,29 @@ def get_state(key: str, default: Any = None) -> Any:
     if not os.path.exists(state_file):
         return default
 
-    with open(state_file, "r") as f:
-        state = json.load(f)
+    state = _read_json(state_file)
     return state.get(key, default)
 
 
+def get_states(**defaults: Any) -> dict[str, Any]:
+    """Get several persistent state values with a single read; keyword values are the defaults."""
+    state_file = os.path.join(_ensure_dir("state"), "agent_state.json")
+    state = _read_json(state_file) if os.path.exists(state_file) else {}
+    return {key: state.get(key, default) for key, default in defaults.items()}
+
+
 def set_state(key: str, value: Any) -> None:
     """Set a persistent state value."""
+    update_state(**{key: value})
+
+
+def update_state(**values: Any) -> None:
+    """Set several persistent state values with a single read and write of the state file."""
     state_file = os.path.join(_ensure_dir("state"), "agent_state.json")
 
     state = {}
     if os.path.exists(state_file):
-        with open(state_file, "r") as f:
-            state = json.load(f)
+        state = _read_json(state_file)
 
-    state[key] = value
-    with open(state_file, "w") as f:
-        json.dump(state, f, indent=2, default=str)
+    state.update(values)
+    _write_json(state_file, state, indent=True)
@@ -52,6 +52,24 @@ class TestScraperHelpers:
 
         assert is_auth_blocked(result) is False
 
+    def test_write_limiter_paces_from_the_first_write(self):
+        """A fresh bucket should not burst: writes are spaced by the minimum interval."""
+        import asyncio
+        import time
+        from scrapers.moltbook_scraper import _TokenBucket
+
+        async def timed_acquires():
+            bucket = _TokenBucket(rate=100, period=1, min_interval=0.05)
+            stamps = []
+            for _ in range(3):
+                await bucket.acquire()
+                stamps.append(time.monotonic())
+            return stamps
+
+        stamps = asyncio.run(timed_acquires())
+        gaps = [later - earlier for earlier, later in zip(stamps, stamps[1:])]
+        assert all(gap >= 0.045 for gap in gaps)
+
 
 class TestAnalyzer:
     """Test trend analyzer functions."""
@@ -72,6 +90,18 @@ class TestAnalyzer:
         kw_words = [k["keyword"] for k in keywords]
         assert "blockchain" in kw_words or "security" in kw_words
 
+    def test_bigram_extraction(self):
+        from analyzers.trend_analyzer import extract_bigram_topics
+
+        posts = [
+            {"title": "Prompt injection attacks", "content": "Prompt injection keeps showing up."},
+            {"title": "Defending against prompt injection"},
+        ]
+
+        topics = extract_bigram_topics(posts, top_n=3)
+        assert topics[0]["topic"] == "prompt injection"
+        assert topics[0]["count"] == 3
+
     def test_empty_posts(self):
         from analyzers.trend_analyzer import extract_keywords
         keywords = extract_keywords([], top_n=5)
@@ -99,6 +129,144 @@ class TestSentiment:
         assert result["label"] == "neutral"
 
 
+class TestAutoReplier:
+    """Test auto-reply pattern matching."""
+
+    def test_triggers_match_whole_words_only(self):
+        from reporters.auto_replier import _match_pattern
+
+        # "how" inside "showcase" must not count as a method question
+        assert _match_pattern("this showcase is solid overall")[1] == "default"
+        assert _match_pattern("how do you get this data?")[1] == "question_about_method"
+
+    @staticmethod
+    def _comment(comment_id, author, content="Interesting trend data, thanks for sharing it"):
+        return {"id": comment_id, "author": {"name": author}, "content": content}
+
+    @staticmethod
+    def _run_auto_reply(monkeypatch, tmp_path, comments, *, cursor=None, reply_result=None,
+                        max_replies=5, dry_run=False):
+        """Run one auto-reply pass over a single post (comments newest-first) with the API stubbed."""
+        import asyncio
+        from reporters import auto_replier
+        from utils import storage
+
+        monkeypatch.setattr(storage, "DATA_DIR", str(tmp_path))
+        if cursor:
+            storage.update_state(post_last_comment={"p1": cursor})
+        sent = []
+
+        async def fake_posts():
+            return [{"id": "p1", "title": "Weekly trend report"}]
+
+        async def fake_comments(post_id, sort="top"):
+            return comments
+
+        async def fake_reply(comment_id, text):
+            sent.append(comment_id)
+            return reply_result or {"success": True}
+
+        async def fake_comment(post_id, text, parent_id=None):
+            return reply_result
+
+        async def no_llm(*args, **kwargs):
+            return None
+
+        async def no_block():
+            return None
+
+        monkeypatch.setattr(auto_replier, "get_my_posts", fake_posts)
+        monkeypatch.setattr(auto_replier, "scrape_post_comments", fake_comments)
+        monkeypatch.setattr(auto_replier, "create_comment_reply", fake_reply)
+        monkeypatch.setattr(auto_replier, "create_comment", fake_comment)
+        monkeypatch.setattr(auto_replier, "generate_llm_reply", no_llm)
+        monkeypatch.setattr(auto_replier, "get_auth_block_status", no_block)
+
+        asyncio.run(auto_replier._auto_reply(max_replies, dry_run))
+        return sent, storage.get_states(post_last_comment={})["post_last_comment"]
+
+    def test_cursor_stops_the_newest_first_scan(self, monkeypatch, tmp_path):
+        comments = [self._comment("c2", "alice"), self._comment("c1", "bob"), self._comment("c0", "carol")]
+        sent, cursors = self._run_auto_reply(monkeypatch, tmp_path, comments, cursor="c1")
+
+        # c1 and older were walked on a previous run; only c2 is new
+        assert sent == ["c2"]
+        assert cursors == {"p1": "c2"}
+
+    def test_cursor_stays_behind_deferred_comments(self, monkeypatch, tmp_path):
+        # A second comment by the same author on the same post is put off to a later run
+        comments = [self._comment("c2", "alice"), self._comment("c1", "alice")]
+        sent, cursors = self._run_auto_reply(monkeypatch, tmp_path, comments)
+
+        assert sent == ["c2"]
+        assert cursors == {}
+
+    def test_cursor_unchanged_on_dry_run(self, monkeypatch, tmp_path):
+        comments = [self._comment("c1", "alice")]
+        sent, cursors = self._run_auto_reply(monkeypatch, tmp_path, comments, dry_run=True)
+
+        assert sent == []
+        assert cursors == {}
+
+    def test_cursor_unchanged_when_walk_is_cut_short(self, monkeypatch, tmp_path):
+        comments = [
+            self._comment("c2", "alice"),
+            self._comment("c1", "bob", "How do you get this data for the report?"),
+        ]
+        sent, cursors = self._run_auto_reply(monkeypatch, tmp_path, comments, max_replies=1)
+        assert sent == ["c2"]
+        assert cursors == {}
+
+        blocked = {"success": False, "status_code": 401, "error": "unauthorized"}
+        sent, cursors = self._run_auto_reply(
+            monkeypatch, tmp_path / "blocked", comments[:1], reply_result=blocked
+        )
+        assert sent == ["c2"]
+        assert cursors == {}
+
+
+class TestStorage:
+    """Test JSON storage helpers."""
+
+    def test_load_latest_picks_up_rewritten_file(self, tmp_path, monkeypatch):
+        import json
+        import os
+        from utils import storage
+
+        monkeypatch.setattr(storage, "DATA_DIR", str(tmp_path))
+        analyzed = tmp_path / "analyzed"
+        analyzed.mkdir()
+        path = analyzed / "analysis_2026-01-01_000000.json"
+
+        path.write_text(json.dumps({"keywords": ["first"]}))
+        assert storage.load_latest("analyzed", "analysis") == {"keywords": ["first"]}
+        storage.load_latest("analyzed", "analysis")["keywords"].append("mutated")
+        assert storage.load_latest("analyzed", "analysis") == {"keywords": ["first"]}
+
+        path.write_text(json.dumps({"keywords": ["second"]}))
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+        assert storage.load_latest("analyzed", "analysis") == {"keywords": ["second"]}
+
+    def test_content_hash_ignores_key_order(self):
+        from utils import storage
+
+        key = storage.content_hash({"b": 1, "a": [1, 2]})
+        assert key == storage.content_hash({"a": [1, 2], "b": 1})
+        assert key != storage.content_hash({"a": [1, 2], "b": 2})
+
+    def test_get_states_reads_several_keys_with_defaults(self, tmp_path, monkeypatch):
+        from utils import storage
+
+        monkeypatch.setattr(storage, "DATA_DIR", str(tmp_path))
+        assert storage.get_states(replied_comment_ids=[]) == {"replied_comment_ids": []}
+
+        storage.update_state(replied_comment_ids=["c1"], last_full_run={"published": True})
+        assert storage.get_states(replied_comment_ids=[], post_last_comment={}) == {
+            "replied_comment_ids": ["c1"],
+            "post_last_comment": {},
+        }
+
+
 class TestERC8004:
     """Test ERC-8004 client functions."""
 